@@ -2,12 +2,14 @@
 HTTP Client Layer - Singleton Pattern
 Provides a robust, reusable async HTTP client with global error handling.
 """
+import asyncio
 import httpx
 import json
 from typing import Any, Dict, Optional
 from functools import wraps
 
 from app.core.config import settings
+from app.core.serialization import loads as _loads
 
 
 class N8NClientError(Exception):
@@ -50,10 +52,14 @@ class N8NClient:
                 "Accept": "application/json"
             }
             self._timeout = httpx.Timeout(settings.http_timeout, read=60.0)
+            # Explicit pool sizing so concurrent tool fanouts reuse warm
+            # keep-alive sockets instead of paying connect+TLS per request
+            self._limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
             self._client = httpx.AsyncClient(
                 base_url=self._base_url,
                 headers=self._headers,
-                timeout=self._timeout
+                timeout=self._timeout,
+                limits=self._limits
             )
 
     @property
@@ -88,13 +94,16 @@ class N8NClient:
                 params=params
             )
             response.raise_for_status()
-            return response.json()
+            # Decode straight from the response bytes with the orjson-backed
+            # loader; on big execution payloads (runData blobs) this is one
+            # C pass instead of httpx's stdlib json over a decoded str
+            return _loads(response.content)
 
         except httpx.HTTPStatusError as e:
             error_detail = "Unknown error"
             try:
                 # Try to parse JSON error from n8n
-                error_detail = e.response.json()
+                error_detail = _loads(e.response.content)
             except Exception:
                 # Fallback to text for HTML/Plaintext errors (common in proxy/auth failures)
                 error_detail = e.response.text[:200]  # Truncate to avoid massive HTML dumps
@@ -131,6 +140,41 @@ def get_client() -> N8NClient:
     return N8NClient()
 
 
+def single_flight(func):
+    """
+    Coalesce concurrent identical calls into one in-flight execution.
+
+    While a call with the same arguments is running, later callers await
+    the same task instead of fanning out duplicate backend requests.
+    Nothing is cached: once the call resolves, the next invocation runs
+    fresh. Awaiters are shielded so one cancelled caller doesn't abort
+    the shared call for the rest.
+    """
+    inflight: Dict[Any, asyncio.Task] = {}
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable argument (e.g. a list filter): run uncoalesced
+            return await func(*args, **kwargs)
+
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            # Under an eager task factory the coroutine may already have
+            # finished here (e.g. served from an in-module cache with no
+            # awaits); retaining a done task would freeze its result for
+            # every later call, so only track genuinely in-flight work
+            if not task.done():
+                inflight[key] = task
+                task.add_done_callback(lambda _: inflight.pop(key, None))
+        return await asyncio.shield(task)
+    return wrapper
+
+
 def safe_tool(func):
     """
     Decorator for MCP tools.
@@ -31,8 +31,9 @@ from app.services.orchestration import workflow_lint, generate_documentation, ex
 
 # Docker services
 from app.services.docker import (
-    list_docker_containers, get_container_logs, diagnose_container_errors, get_container_stats, 
-    restart_container, analyze_all_container_errors, get_container_inspect, list_container_files, 
+    list_docker_containers, get_container_logs, diagnose_container_errors, get_container_stats,
+    get_all_container_stats, restart_container, analyze_all_container_errors, get_container_inspect,
+    get_container_inspect_bulk, list_container_files,
     read_container_file, run_container_command, run_sql_in_container, prune_docker_images, 
     check_container_connection, inspect_container_dns, audit_image_freshness, backup_volume_to_host, 
     grep_log_across_containers, scan_container_security, recommend_resource_limits, 
@@ -114,9 +115,11 @@ REGISTRY = {
     "get_logs": get_container_logs,
     "diagnose_container_errors": diagnose_container_errors,
     "get_stats": get_container_stats,
+    "get_all_stats": get_all_container_stats,
     "restart_container": restart_container,
     "analyze_all_errors": analyze_all_container_errors,
     "inspect_container": get_container_inspect,
+    "inspect_containers": get_container_inspect_bulk,
     "list_files": list_container_files,
     "read_file": read_container_file,
     "run_command": run_container_command,
@@ -0,0 +1,60 @@
+"""
+Serialization Layer - JSON Boundary
+Central place for turning tool results into JSON, using orjson when installed.
+"""
+import json
+import os
+from typing import Any, Optional
+
+# orjson import with graceful fallback (serializes straight to bytes,
+# several times faster than stdlib json on large payloads)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Indentation is for humans; MCP consumers are other tools, so pretty
+# printing is opt-in per call or globally via this env toggle. Read from
+# the environment directly: settings requires N8N_API_KEY and this module
+# must import standalone.
+PRETTY_DEFAULT = os.environ.get("MCP_PRETTY_JSON", "").lower() in ("1", "true", "yes")
+
+
+def dumps_bytes(obj: Any, pretty: Optional[bool] = None) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes without an intermediate str.
+
+    Use this wherever the consumer accepts bytes (file writes, sockets);
+    it skips the str->bytes re-encode that json.dumps forces.
+    """
+    if pretty is None:
+        pretty = PRETTY_DEFAULT
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None).encode("utf-8")
+
+
+def loads(data) -> Any:
+    """
+    Parse JSON from str or bytes.
+
+    orjson decodes large execution payloads several times faster than
+    stdlib json; its JSONDecodeError subclasses ValueError (and stdlib
+    JSONDecodeError), so existing except clauses keep working.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, pretty: Optional[bool] = None) -> str:
+    """
+    Serialize to a JSON str for the MCP tool boundary.
+
+    FastMCP tool results must be str, so the decode happens exactly once,
+    here at the edge.
+    """
+    if ORJSON_AVAILABLE:
+        return dumps_bytes(obj, pretty=pretty).decode("utf-8")
+    return json.dumps(obj, indent=2 if pretty else None)
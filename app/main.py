@@ -2,6 +2,7 @@
 Quantum Core Gateway - Senior Advanced Edition
 Exposes < 15 Semantic Kernels for High-Fidelity Orchestration.
 """
+import asyncio
 import json
 from contextlib import asynccontextmanager
 from typing import Dict, Any, List
@@ -19,6 +20,12 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 60)
     logger.info("⚡ Expert Kernel Gateway Starting")
     logger.info("=" * 60)
+    # Eager tasks (3.12+) let the gather fanouts in the protocol tools run
+    # coroutines that complete without suspending (cache hits, short
+    # circuits) synchronously, skipping the scheduling round-trip
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        logger.info("Eager task factory enabled")
     yield
     client = get_client()
     await client.close()
@@ -8,6 +8,7 @@ from typing import List, Dict, Any, Optional, Union
 from app.core.client import get_client, safe_tool
 from app.core.config import settings
 from app.core.logging import architect_logger as logger
+from app.services.live_surgery import _invalidate_workflow
 
 
 def _parse_json_safe(data: Union[str, List, Dict], field_name: str) -> Union[List, Dict]:
@@ -125,7 +126,10 @@ async def deploy_workflow(
     if activate:
         logger.info(f"Activating workflow {workflow_id}")
         await client.post(f"/workflows/{workflow_id}/activate")
-    
+
+    # Drop any cached copy so read tools see the upserted body
+    _invalidate_workflow(workflow_id)
+
     # Build browser URL
     editor_url = f"{settings.n8n_editor_url}/workflow/{workflow_id}"
     
@@ -21,15 +21,8 @@ _monitoring_state = {
 }
 
 
-@safe_tool
-async def health_check_all() -> str:
-    """
-    Comprehensive system health check across all components.
-    Checks: n8n API, workflows, credentials, recent executions.
-    
-    Returns:
-        JSON string with complete health status.
-    """
+async def _health_check_all() -> Dict[str, Any]:
+    """Dict-returning core of health_check_all for in-process callers."""
     logger.info("Running comprehensive health check")
     
     client = get_client()
@@ -108,15 +101,27 @@ async def health_check_all() -> str:
             health_report["components"]["executions"] = {"status": "error", "message": str(e)}
         
         logger.info(f"Health check complete: {health_report['status']}")
-        return json.dumps(health_report, indent=2)
-        
+        return health_report
+
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "error": str(e),
             "timestamp": datetime.now().isoformat()
-        }, indent=2)
+        }
+
+
+@safe_tool
+async def health_check_all() -> str:
+    """
+    Comprehensive system health check across all components.
+    Checks: n8n API, workflows, credentials, recent executions.
+
+    Returns:
+        JSON string with complete health status.
+    """
+    return json.dumps(await _health_check_all(), indent=2)
 
 
 @safe_tool
@@ -473,15 +478,8 @@ async def auto_restart_failed_workflows(
         }, indent=2)
 
 
-@safe_tool
-async def get_system_metrics() -> str:
-    """
-    Get comprehensive system metrics for n8n.
-    Includes execution stats, workflow counts, and performance indicators.
-    
-    Returns:
-        JSON string with system metrics.
-    """
+async def _get_system_metrics() -> Dict[str, Any]:
+    """Dict-returning core of get_system_metrics for in-process callers."""
     logger.info("Collecting system metrics")
     
     client = get_client()
@@ -525,7 +523,7 @@ async def get_system_metrics() -> str:
         
         avg_exec_time = sum(exec_times) / len(exec_times) if exec_times else 0
         
-        return json.dumps({
+        return {
             "status": "success",
             "timestamp": datetime.now().isoformat(),
             "workflows": {
@@ -541,11 +539,23 @@ async def get_system_metrics() -> str:
                 "success_rate_percent": round(success_rate, 1),
                 "avg_execution_time_seconds": round(avg_exec_time, 2)
             }
-        }, indent=2)
-        
+        }
+
     except Exception as e:
         logger.error(f"Error collecting metrics: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "error": str(e)
-        }, indent=2)
+        }
+
+
+@safe_tool
+async def get_system_metrics() -> str:
+    """
+    Get comprehensive system metrics for n8n.
+    Includes execution stats, workflow counts, and performance indicators.
+
+    Returns:
+        JSON string with system metrics.
+    """
+    return json.dumps(await _get_system_metrics(), indent=2)
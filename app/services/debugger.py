@@ -9,6 +9,12 @@ from app.core.client import get_client, safe_tool
 from app.core.logging import debugger_logger as logger
 
 
+def _wf_name(execution: Dict[str, Any]) -> Optional[str]:
+    """Read the workflow name from an execution without building throwaway dicts."""
+    workflow_data = execution.get("workflowData")
+    return workflow_data.get("name") if workflow_data else None
+
+
 def _extract_error_details(execution_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Deep dive into execution data to extract precise error information.
@@ -31,8 +37,9 @@ def _extract_error_details(execution_data: Dict[str, Any]) -> Dict[str, Any]:
     # Primary error location (top-level error object)
     if "error" in result_data:
         top_error = result_data["error"]
-        error_info["failed_node"] = top_error.get("node", {}).get("name", "Unknown Node")
-        error_info["node_type"] = top_error.get("node", {}).get("type", "Unknown")
+        node = top_error.get("node") or {}
+        error_info["failed_node"] = node.get("name", "Unknown Node")
+        error_info["node_type"] = node.get("type", "Unknown")
         error_info["error_message"] = top_error.get("message", "No message")
         error_info["stack_trace"] = top_error.get("stack")
         
@@ -71,14 +78,15 @@ def _extract_error_details(execution_data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @safe_tool
-async def diagnose_execution(execution_id: str) -> str:
+async def diagnose_execution(execution_id: str, pretty: bool = False) -> str:
     """
     Deep dive diagnosis of a specific execution.
     Navigates the execution JSON to find exactly what failed and why.
-    
+
     Args:
         execution_id: The ID of the execution to analyze.
-    
+        pretty: If True, indent the JSON output (default: False, compact).
+
     Returns:
         JSON string with detailed diagnosis including:
         - Failed node name and type
@@ -94,7 +102,7 @@ async def diagnose_execution(execution_id: str) -> str:
     # Extract workflow info
     workflow_info = {
         "workflow_id": execution.get("workflowId"),
-        "workflow_name": execution.get("workflowData", {}).get("name", "Unknown"),
+        "workflow_name": _wf_name(execution) or "Unknown",
         "started_at": execution.get("startedAt"),
         "finished_at": execution.get("stoppedAt"),
         "status": execution.get("status"),
@@ -112,17 +120,33 @@ async def diagnose_execution(execution_id: str) -> str:
     }
     
     logger.info(f"Diagnosis complete: Node '{error_details['failed_node']}' failed with: {error_details['error_message'][:100]}")
-    
-    return json.dumps(diagnosis, indent=2)
+
+    return json.dumps(diagnosis, indent=2 if pretty else None)
+
+
+# Recommendation templates keyed by known n8n error class names.
+# Checked before the substring heuristics below so executions with a parsed
+# error_type skip the repeated message scans.
+_RECO_BY_TYPE = {
+    "NodeApiError": "Node '{node}' received an API error. Check the endpoint URL, credentials, and the upstream service status.",
+    "NodeOperationError": "Node '{node}' failed during its operation. Verify its parameters and the shape of its input data.",
+    "ExpressionError": "An expression in node '{node}' failed to evaluate. Check referenced fields exist in the incoming items.",
+    "WorkflowOperationError": "The workflow operation around node '{node}' failed. Check workflow settings and node connections.",
+}
 
 
 def _generate_recommendation(error_info: Dict[str, Any]) -> str:
     """
     Generate an AI-friendly recommendation based on the error type.
     """
-    message = error_info.get("error_message", "").lower()
     node = error_info.get("failed_node", "")
-    
+
+    template = _RECO_BY_TYPE.get(error_info.get("error_type"))
+    if template:
+        return template.format(node=node)
+
+    message = error_info.get("error_message", "").lower()
+
     if "404" in message or "not found" in message:
         return f"The endpoint or resource in node '{node}' returned 404. Check the URL path or resource ID."
     
@@ -144,15 +168,17 @@ def _generate_recommendation(error_info: Dict[str, Any]) -> str:
 @safe_tool
 async def analyze_execution_failures(
     workflow_id: Optional[str] = None,
-    limit: int = 5
+    limit: int = 5,
+    pretty: bool = False
 ) -> str:
     """
     Analyze multiple failed executions to find patterns.
-    
+
     Args:
         workflow_id: Optional workflow ID to filter by.
         limit: Maximum number of failed executions to analyze.
-    
+        pretty: If True, indent the JSON output (default: False, compact).
+
     Returns:
         JSON string with analysis of all failed executions.
     """
@@ -171,13 +197,14 @@ async def analyze_execution_failures(
     executions = data.get("data", [])
     
     analyses = []
+    append_analysis = analyses.append
     for exc in executions:
         error_details = _extract_error_details(exc)
-        
-        analyses.append({
+
+        append_analysis({
             "execution_id": exc["id"],
             "workflow_id": exc.get("workflowId"),
-            "workflow_name": exc.get("workflowData", {}).get("name"),
+            "workflow_name": _wf_name(exc),
             "started_at": exc.get("startedAt"),
             "failed_node": error_details["failed_node"],
             "error_type": error_details["error_type"],
@@ -186,23 +213,25 @@ async def analyze_execution_failures(
         })
     
     logger.info(f"Analyzed {len(analyses)} failed executions")
-    return json.dumps(analyses, indent=2)
+    return json.dumps(analyses, indent=2 if pretty else None)
 
 
 @safe_tool
 async def get_execution_history(
     workflow_id: Optional[str] = None,
     limit: int = 10,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    pretty: bool = False
 ) -> str:
     """
     Get execution history for workflows.
-    
+
     Args:
         workflow_id: Optional workflow ID to filter by.
         limit: Maximum number of executions to return.
         status: Optional status filter ('success', 'error', 'waiting').
-    
+        pretty: If True, indent the JSON output (default: False, compact).
+
     Returns:
         JSON string with execution summaries.
     """
@@ -217,15 +246,16 @@ async def get_execution_history(
     executions = data.get("data", [])
     
     summaries = []
+    append_summary = summaries.append
     for exc in executions:
-        summaries.append({
+        append_summary({
             "id": exc["id"],
             "workflow_id": exc.get("workflowId"),
-            "workflow_name": exc.get("workflowData", {}).get("name"),
+            "workflow_name": _wf_name(exc),
             "status": exc.get("status"),
             "started_at": exc.get("startedAt"),
             "finished_at": exc.get("stoppedAt"),
             "mode": exc.get("mode")
         })
-    
-    return json.dumps(summaries, indent=2)
+
+    return json.dumps(summaries, indent=2 if pretty else None)
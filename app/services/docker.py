@@ -2,12 +2,28 @@
 Docker Debugger Service - Container Diagnostics
 Provides comprehensive tools for analyzing Docker container logs, errors, and status.
 """
-import json
+import asyncio
+import errno
+import gzip
+import heapq
+import inspect
+import io
+import os
 import re
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+import socket
+import stat
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from typing import Optional, List, Dict, Any, Iterable, Iterator
 
 from app.core.logging import debugger_logger as logger
+from app.core.serialization import dumps as _dumps
 
 # Docker SDK import with graceful fallback
 try:
@@ -23,51 +39,105 @@ except ImportError:
     logger.warning("Docker SDK not installed. Run: pip install docker")
 
 
+# Shared client so all tools reuse one connection pool to the daemon
+# instead of rebuilding a requests.Session per call
+_CLIENT_LOCK = threading.Lock()
+_CLIENT = None
+
+
 def _get_docker_client():
-    """Get Docker client with error handling."""
+    """Get the shared Docker client, creating (or rebuilding) it on demand."""
+    global _CLIENT
     if not DOCKER_AVAILABLE:
         raise RuntimeError("Docker SDK not installed. Run: pip install docker>=7.0.0")
-    try:
-        return docker.from_env()
-    except DockerException as e:
-        raise RuntimeError(f"Cannot connect to Docker daemon. Is Docker Desktop running? Error: {e}")
+    with _CLIENT_LOCK:
+        if _CLIENT is not None:
+            try:
+                _CLIENT.ping()
+                return _CLIENT
+            except DockerException:
+                # Daemon restarted or socket went away; rebuild below
+                _CLIENT = None
+        try:
+            _CLIENT = docker.from_env(timeout=30, max_pool_size=32)
+        except DockerException as e:
+            raise RuntimeError(f"Cannot connect to Docker daemon. Is Docker Desktop running? Error: {e}")
+        return _CLIENT
+
+
+def _reset_docker_client():
+    """Drop the cached client so the next call reconnects (used by tests)."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is not None:
+            try:
+                _CLIENT.close()
+            except Exception:
+                pass
+            _CLIENT = None
+
+
+async def _run(fn, *args, **kwargs):
+    """Run a blocking docker-py call in a worker thread to keep the event loop free."""
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+# Name -> (id, resolved_at) cache so repeat exec/log tools skip the full
+# inspect round-trip that containers.get() issues per call
+_NAME_ID_CACHE: Dict[str, tuple] = {}
+_NAME_ID_TTL = 60.0
+
+
+def _container_ref(client, container_name: str):
+    """
+    Lightweight container handle resolved through the name->id cache.
+
+    Only for tools that issue id-based calls (exec, logs, commit) and never
+    read attrs or status from the handle. The cache is cleared whenever a
+    tool hits NotFound, so stale ids self-heal on the next call.
+    """
+    now = time.monotonic()
+    entry = _NAME_ID_CACHE.get(container_name)
+    if entry and now - entry[1] < _NAME_ID_TTL:
+        container_id = entry[0]
+    else:
+        container_id = client.api.inspect_container(container_name)["Id"]
+        _NAME_ID_CACHE[container_name] = (container_id, now)
+    return client.containers.prepare_model({"Id": container_id})
 
 
 def _safe_docker_tool(func):
     """Decorator for Docker tools with standardized error handling."""
-    from functools import wraps
-    import inspect
-    
-    @wraps(func)
     @wraps(func)
     async def wrapper(*args, **kwargs):
         try:
             return await func(*args, **kwargs)
         except NotFound as e:
-            return json.dumps({
+            _NAME_ID_CACHE.clear()
+            return _dumps({
                 "status": "error",
                 "error_type": "ContainerNotFound",
                 "message": str(e)
-            }, indent=2)
+            })
         except APIError as e:
-            return json.dumps({
+            return _dumps({
                 "status": "error",
                 "error_type": "DockerAPIError",
                 "message": str(e)
-            }, indent=2)
+            })
         except RuntimeError as e:
-            return json.dumps({
+            return _dumps({
                 "status": "error",
                 "error_type": "DockerConnectionError",
                 "message": str(e)
-            }, indent=2)
+            })
         except Exception as e:
             logger.error(f"Docker tool error: {e}")
-            return json.dumps({
+            return _dumps({
                 "status": "error",
                 "error_type": type(e).__name__,
                 "message": str(e)
-            }, indent=2)
+            })
     
     # Preserve original signature for FastMCP
     wrapper.__signature__ = inspect.signature(func)
@@ -146,49 +216,237 @@ ERROR_PATTERNS = {
 }
 
 
-def _analyze_log_errors(logs: str) -> List[Dict[str, Any]]:
-    """Analyze logs for common error patterns."""
+# Patterns fused once at import time into a single alternation with named
+# groups, so the per-line loop in _analyze_log_errors does one native regex
+# walk instead of 13 Python-level re.search dispatches.
+_COMPILED_ALTERNATION = re.compile(
+    "|".join(f"(?P<{name}>{info['pattern']})" for name, info in ERROR_PATTERNS.items()),
+    re.IGNORECASE
+)
+# Severity order used for ranking/sorting issues without per-issue list scans
+_SEV_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+_PATTERN_META = {
+    name: (info["severity"], _SEV_RANK[info["severity"]], info["recommendation"])
+    for name, info in ERROR_PATTERNS.items()
+}
+
+# Cheap prefilter run before the full alternation: one C-level scan instead
+# of a .lower() copy plus ten Python substring checks per line.
+_ERROR_INDICATOR_RE = re.compile(
+    r"error|err|fatal|critical|exception|failed|failure|denied|refused|timeout",
+    re.IGNORECASE
+)
+
+
+# Bytes twins of the patterns above: the scan runs on raw log bytes, so the
+# utf-8 decode is only paid for the few lines actually recorded.
+_ALTERNATION_BYTES = re.compile(_COMPILED_ALTERNATION.pattern.encode("ascii"), re.IGNORECASE)
+_ERROR_INDICATOR_BYTES = re.compile(_ERROR_INDICATOR_RE.pattern.encode("ascii"), re.IGNORECASE)
+
+
+# Bounds on caller-supplied log retrieval: a tail of a million lines on a
+# chatty container would otherwise make dockerd marshal (and this process
+# scan) many MB per call
+_MAX_TAIL = 5000
+_MAX_LOG_BYTES = 4 * 1024 * 1024
+_MAX_ANALYZE_LINES = 50_000
+
+
+def _clamp_tail(tail: int) -> int:
+    """Clamp a caller-supplied tail value to the retrieval bound."""
+    return min(int(tail), _MAX_TAIL)
+
+
+def _iter_log_lines(container, **kwargs) -> Iterator[bytes]:
+    """
+    Yield raw log lines from a streamed container.logs() call.
+    Keeps peak memory at one line instead of bytes -> str -> list copies
+    of the whole log buffer; lines stay undecoded for the bytes scanners.
+    Stops after _MAX_LOG_BYTES or _MAX_ANALYZE_LINES and yields a
+    truncation marker line, so analysis cannot blow up on multi-GB logs.
+    """
+    # Fragments of the current, incomplete line. Collected in a list and
+    # joined once per line: repeated bytes += concatenation re-copies the
+    # whole prefix per chunk and goes quadratic on long single-line logs.
+    parts = []
+    bytes_seen = 0
+    lines_seen = 0
+    for chunk in container.logs(stream=True, **kwargs):
+        bytes_seen += len(chunk)
+        if b"\n" not in chunk:
+            parts.append(chunk)
+        else:
+            lines = chunk.split(b"\n")
+            if parts:
+                parts.append(lines[0])
+                lines[0] = b"".join(parts)
+                parts.clear()
+            remainder = lines.pop()
+            if remainder:
+                parts.append(remainder)
+            lines_seen += len(lines)
+            yield from lines
+        if bytes_seen > _MAX_LOG_BYTES:
+            yield b"... [log truncated: %d byte cap reached]" % _MAX_LOG_BYTES
+            return
+        if lines_seen > _MAX_ANALYZE_LINES:
+            yield b"... [log truncated: %d line cap reached]" % _MAX_ANALYZE_LINES
+            return
+    if parts:
+        yield b"".join(parts)
+
+
+# Dotted numeric version tags ('14', '14.1.2'); compiled once at import
+_VERSION_RE = re.compile(r"^\d+(\.\d+)*$")
+
+
+def _parse_version_tag(tag: str) -> Optional[tuple]:
+    """Parse a dotted numeric tag ('14.1') to an int tuple, else None."""
+    if not _VERSION_RE.match(tag):
+        return None
+    return tuple(int(part) for part in tag.split("."))
+
+
+@lru_cache(maxsize=64)
+def _compile_bytes_matcher(pattern: str):
+    """
+    Build a case-insensitive matcher for scanning undecoded log lines,
+    so only the lines that actually match ever get decoded.
+
+    Literal patterns (no regex metacharacters) get a plain substring
+    check, which is several times faster than the regex engine per line;
+    anything else gets a single precompiled Pattern, compiled once
+    instead of re-looked-up for every line scanned.
+    """
+    raw = pattern.encode("utf-8", errors="replace")
+    if re.escape(pattern) == pattern:
+        needle = raw.lower()
+        return lambda line: needle in line.lower()
+    return re.compile(raw, re.IGNORECASE).search
+
+
+def _pretty_image(image: str) -> str:
+    """Shorten an untagged sha256 image reference for display."""
+    if image.startswith("sha256:"):
+        return image[7:19]
+    return image
+
+
+def _image_tag_map(client) -> Dict[str, str]:
+    """
+    Map image IDs to a display tag with one /images/json call.
+
+    Dereferencing container.image.tags per container costs one image
+    inspect each; with M images shared across N containers this resolves
+    all of them in a single round-trip.
+    """
+    return {
+        img.id: (img.tags[0] if img.tags else img.short_id)
+        for img in client.images.list()
+    }
+
+
+# Leading RFC3339 timestamp emitted by logs(timestamps=True); stripped so
+# repeats of the same message bucket together
+_TS_PREFIX_RE = re.compile(rb"^\S+\s+")
+
+
+def _stderr_line_keys(container, **kwargs) -> set:
+    """
+    Collect timestamp-stripped stderr lines as a set of bytes keys.
+
+    The daemon multiplexes stdout and stderr into one stream; asking for
+    stderr only makes dockerd drop the stdout frames server-side, so this
+    second pass is cheap (stderr is usually a small fraction of output)
+    and lets the analyzer tag which errors the process itself wrote to
+    stderr rather than inferring everything from text patterns.
+    """
+    strip_timestamp = _TS_PREFIX_RE.sub
+    keys = set()
+    for line in _iter_log_lines(container, stdout=False, stderr=True, **kwargs):
+        stripped = line.strip()
+        if stripped:
+            keys.add(strip_timestamp(b"", stripped, count=1))
+    return keys
+
+
+def _analyze_log_errors(
+    log_lines: Iterable[bytes],
+    stderr_keys: Optional[set] = None,
+    timestamps: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Analyze raw log lines for common error patterns.
+    When stderr_keys is given, each result gains a "stream" field and
+    generic errors written to stderr are promoted from low to medium.
+    timestamps says whether lines carry an RFC3339 prefix to strip; pass
+    False when the fetch used timestamps=False so the dedup key doesn't
+    eat the first word of the message.
+    """
     detected_errors = []
-    log_lines = logs.split('\n')
-    
+    search_patterns = _ALTERNATION_BYTES.search
+    search_indicators = _ERROR_INDICATOR_BYTES.search
+    strip_timestamp = _TS_PREFIX_RE.sub if timestamps else None
+
+    # First pass: bucket identical messages so a crash loop flooding the
+    # tail costs one regex scan per unique line instead of per occurrence.
+    # Each bucket keeps the line number and text of its first occurrence.
+    unique: Dict[bytes, list] = {}
     for line_num, line in enumerate(log_lines, 1):
-        line_lower = line.lower()
-        
         # Skip empty lines
-        if not line.strip():
+        stripped = line.strip()
+        if not stripped:
             continue
-        
+
         # Check for general error indicators
-        is_error_line = any(indicator in line_lower for indicator in [
-            'error', 'err', 'fatal', 'critical', 'exception', 
-            'failed', 'failure', 'denied', 'refused', 'timeout'
-        ])
-        
-        if not is_error_line:
+        if not search_indicators(line):
             continue
-        
-        # Match against known patterns
-        for error_name, error_info in ERROR_PATTERNS.items():
-            if re.search(error_info["pattern"], line, re.IGNORECASE):
-                detected_errors.append({
-                    "line_number": line_num,
-                    "error_type": error_name,
-                    "severity": error_info["severity"],
-                    "log_line": line.strip()[:200],  # Truncate long lines
-                    "recommendation": error_info["recommendation"]
-                })
-                break
+
+        key = strip_timestamp(b"", stripped, count=1) if strip_timestamp else stripped
+        bucket = unique.get(key)
+        if bucket is None:
+            unique[key] = [line_num, 1, stripped]
         else:
-            # Generic error if no pattern matched
-            if is_error_line:
-                detected_errors.append({
-                    "line_number": line_num,
-                    "error_type": "generic_error",
-                    "severity": "low",
-                    "log_line": line.strip()[:200],
-                    "recommendation": "Review this error line for more context."
-                })
-    
+            bucket[1] += 1
+
+    append_error = detected_errors.append
+    for key, (first_line, occurrences, stripped) in unique.items():
+        # Decode and truncate only lines that get recorded
+        truncated = stripped.decode("utf-8", errors="replace")[:200]
+        from_stderr = stderr_keys is not None and key in stderr_keys
+
+        # Match against known patterns (timestamp already stripped)
+        match = search_patterns(key)
+        if match:
+            severity, severity_rank, recommendation = _PATTERN_META[match.lastgroup]
+            entry = {
+                "line_number": first_line,
+                "error_type": match.lastgroup,
+                "severity": severity,
+                "severity_rank": severity_rank,
+                "log_line": truncated,
+                "occurrences": occurrences,
+                "recommendation": recommendation
+            }
+        else:
+            # Generic error if no pattern matched; a generic line the
+            # process sent to stderr is more trustworthy than one that
+            # merely contains an error-looking word on stdout
+            severity, severity_rank = ("medium", 1) if from_stderr else ("low", 0)
+            entry = {
+                "line_number": first_line,
+                "error_type": "generic_error",
+                "severity": severity,
+                "severity_rank": severity_rank,
+                "log_line": truncated,
+                "occurrences": occurrences,
+                "recommendation": "Review this error line for more context."
+            }
+        if stderr_keys is not None:
+            entry["stream"] = "stderr" if from_stderr else "stdout"
+        append_error(entry)
+
     return detected_errors
 
 
@@ -219,39 +477,59 @@ async def list_docker_containers(
     if filter_status:
         filters["status"] = filter_status
     
-    containers = client.containers.list(all=all_containers, filters=filters)
-    
+    # One summary list call instead of a full inspect round-trip per
+    # container; the /containers/json payload already carries everything
+    # this listing needs
+    raw = await _run(client.api.containers, all=all_containers, filters=filters)
+
+    # Containers started from an untagged digest report "sha256:..." as
+    # their image; resolve those to tags with one images.list call rather
+    # than an inspect per container
+    tag_map = {}
+    if any((entry.get("Image") or "").startswith("sha256:") for entry in raw):
+        tag_map = await _run(_image_tag_map, client)
+
     container_list = []
-    for container in containers:
+    for entry in raw:
         # Get port mappings
-        ports = container.attrs.get("NetworkSettings", {}).get("Ports", {}) or {}
-        port_mappings = []
-        for container_port, host_bindings in ports.items():
-            if host_bindings:
-                for binding in host_bindings:
-                    port_mappings.append(f"{binding.get('HostPort', '?')}:{container_port}")
-        
-        # Get health status if available
-        health = container.attrs.get("State", {}).get("Health", {})
-        health_status = health.get("Status", "no_healthcheck")
-        
+        port_mappings = [
+            f"{p['PublicPort']}:{p['PrivatePort']}/{p.get('Type', 'tcp')}"
+            for p in entry.get("Ports") or []
+            if p.get("PublicPort")
+        ]
+
+        # The summary status string carries health, e.g. "Up 2 hours (healthy)"
+        status_text = entry.get("Status", "")
+        if "(healthy)" in status_text:
+            health_status = "healthy"
+        elif "(unhealthy)" in status_text:
+            health_status = "unhealthy"
+        elif "health: starting" in status_text:
+            health_status = "starting"
+        else:
+            health_status = "no_healthcheck"
+
+        image_ref = entry.get("Image", "")
+        if image_ref.startswith("sha256:"):
+            image_ref = tag_map.get(entry.get("ImageID", ""), _pretty_image(image_ref))
+
         container_list.append({
-            "id": container.short_id,
-            "name": container.name,
-            "image": container.image.tags[0] if container.image.tags else container.image.short_id,
-            "status": container.status,
+            "id": entry["Id"][:12],
+            "name": (entry.get("Names") or ["/?"])[0].lstrip("/"),
+            "image": image_ref,
+            "status": entry.get("State", ""),
+            "status_detail": status_text,
             "health": health_status,
             "ports": port_mappings,
-            "created": container.attrs.get("Created", ""),
-            "started_at": container.attrs.get("State", {}).get("StartedAt", "")
+            "created": datetime.fromtimestamp(entry.get("Created", 0), tz=timezone.utc).isoformat()
         })
     
     logger.info(f"Found {len(container_list)} containers")
-    return json.dumps({
+    return _dumps({
         "status": "success",
         "count": len(container_list),
         "containers": container_list
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -274,28 +552,32 @@ async def get_container_logs(
         JSON string with container logs and metadata.
     """
     logger.info(f"Getting logs for container: {container_name} (tail={tail})")
-    
+
+    tail = _clamp_tail(tail)
     client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
+    container = await _run(client.containers.get, container_name)
+
     kwargs = {
         "tail": tail,
         "timestamps": show_timestamps
     }
     
     if since_minutes:
-        since_time = datetime.utcnow() - timedelta(minutes=since_minutes)
-        kwargs["since"] = since_time
-    
-    logs = container.logs(**kwargs).decode("utf-8", errors="replace")
+        # docker-py forwards an int verbatim as a Unix timestamp; skips the
+        # naive-UTC datetime maths and its serialization on the SDK side
+        kwargs["since"] = int(time.time()) - since_minutes * 60
     
-    return json.dumps({
+    logs = await _run(
+        lambda: b"\n".join(_iter_log_lines(container, **kwargs)).decode("utf-8", errors="replace")
+    )
+
+    return _dumps({
         "status": "success",
         "container": container_name,
         "container_status": container.status,
         "log_lines": tail,
         "logs": logs
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -318,37 +600,53 @@ async def diagnose_container_errors(
         including specific recommendations for each detected issue.
     """
     logger.info(f"Diagnosing errors for container: {container_name}")
-    
+
+    tail = _clamp_tail(tail)
     client = _get_docker_client()
-    container = client.containers.get(container_name)
+    container = await _run(client.containers.get, container_name)
     
-    # Get container info
+    # Get container info; materialize attrs once instead of walking the
+    # nested dicts through the .attrs property per field
+    attrs = container.attrs
+    state = attrs.get("State") or {}
     container_info = {
         "name": container.name,
         "id": container.short_id,
         "status": container.status,
         "image": container.image.tags[0] if container.image.tags else container.image.short_id,
-        "restart_count": container.attrs.get("RestartCount", 0),
-        "exit_code": container.attrs.get("State", {}).get("ExitCode"),
-        "oom_killed": container.attrs.get("State", {}).get("OOMKilled", False)
+        "restart_count": attrs.get("RestartCount", 0),
+        "exit_code": state.get("ExitCode"),
+        "oom_killed": state.get("OOMKilled", False)
     }
     
     # Get logs
     kwargs = {"tail": tail, "timestamps": True}
     if since_minutes:
-        since_time = datetime.utcnow() - timedelta(minutes=since_minutes)
-        kwargs["since"] = since_time
-    
-    logs = container.logs(**kwargs).decode("utf-8", errors="replace")
-    
-    # Analyze for errors
-    detected_errors = _analyze_log_errors(logs)
-    
-    # Categorize by severity
-    critical_errors = [e for e in detected_errors if e["severity"] == "critical"]
-    high_errors = [e for e in detected_errors if e["severity"] == "high"]
-    medium_errors = [e for e in detected_errors if e["severity"] == "medium"]
-    low_errors = [e for e in detected_errors if e["severity"] == "low"]
+        # docker-py forwards an int verbatim as a Unix timestamp; skips the
+        # naive-UTC datetime maths and its serialization on the SDK side
+        kwargs["since"] = int(time.time()) - since_minutes * 60
+    
+    # Analyze while streaming, keeping only the last 2000 chars as raw sample
+    raw_tail = deque(maxlen=2000)
+
+    def _lines():
+        for line in _iter_log_lines(container, **kwargs):
+            raw_tail.extend(line)
+            raw_tail.append(0x0A)
+            yield line
+
+    detected_errors = await _run(
+        lambda: _analyze_log_errors(_lines(), stderr_keys=_stderr_line_keys(container, **kwargs))
+    )
+    
+    # Categorize by severity in a single pass
+    buckets = {"critical": [], "high": [], "medium": [], "low": []}
+    for error in detected_errors:
+        buckets[error["severity"]].append(error)
+    critical_errors = buckets["critical"]
+    high_errors = buckets["high"]
+    medium_errors = buckets["medium"]
+    low_errors = buckets["low"]
     
     # Generate summary
     if container_info["oom_killed"]:
@@ -381,73 +679,334 @@ async def diagnose_container_errors(
             "medium": medium_errors[:3],
             "low": low_errors[:2]
         },
-        "raw_log_sample": logs[-2000:] if len(logs) > 2000 else logs  # Last 2000 chars
+        "raw_log_sample": bytes(raw_tail).decode("utf-8", errors="replace")  # Last 2000 bytes
     }
     
     logger.info(f"Diagnosis complete: {len(detected_errors)} errors found ({len(critical_errors)} critical)")
-    return json.dumps(diagnosis, indent=2)
+    return _dumps(diagnosis)
+
+
+class _StatsCache:
+    """
+    Lazily started per-container stats streams.
+
+    The first read for a container starts a daemon thread iterating
+    client.api.stats(stream=True) and keeping only the latest sample, so
+    repeated reads (dashboards, polling) cost a dict lookup instead of a
+    full Docker round-trip. Streaming is expensive for dockerd when many
+    containers stream at once, so readers idle for more than IDLE_TTL
+    seconds shut themselves down.
+    """
+    IDLE_TTL = 60.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Any] = {}
+        self._last_read: Dict[str, float] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+
+    def get(self, client, container_id: str) -> Optional[Dict[str, Any]]:
+        """Return the latest cached sample, starting the stream on first use."""
+        with self._lock:
+            self._last_read[container_id] = time.monotonic()
+            sample = self._samples.get(container_id)
+            thread = self._threads.get(container_id)
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(
+                    target=self._reader,
+                    args=(client, container_id),
+                    daemon=True
+                )
+                self._threads[container_id] = thread
+                thread.start()
+        return sample
+
+    def _reader(self, client, container_id: str):
+        try:
+            for sample in client.api.stats(container_id, decode=True, stream=True):
+                now = time.monotonic()
+                with self._lock:
+                    self._samples[container_id] = sample
+                    idle = now - self._last_read.get(container_id, now)
+                if idle > self.IDLE_TTL:
+                    break
+        except Exception as e:
+            logger.warning(f"Stats stream for {container_id[:12]} ended: {e}")
+        finally:
+            with self._lock:
+                self._threads.pop(container_id, None)
+                self._samples.pop(container_id, None)
+
+
+_STATS_CACHE = _StatsCache()
+
+# Container-id -> resolved cgroup directory, so repeated stats reads skip
+# the candidate-path probing
+_CGROUP_PATH_CACHE: Dict[str, str] = {}
+
+
+def _resolve_cgroup_dir(container_id: str, controller: str = "") -> Optional[str]:
+    """Locate the cgroup directory for a container (cgroupfs or systemd layout)."""
+    key = f"{controller}:{container_id}"
+    cached = _CGROUP_PATH_CACHE.get(key)
+    if cached and os.path.isdir(cached):
+        return cached
+    root = os.path.join("/sys/fs/cgroup", controller) if controller else "/sys/fs/cgroup"
+    for candidate in (
+        os.path.join(root, "docker", container_id),
+        os.path.join(root, "system.slice", f"docker-{container_id}.scope"),
+    ):
+        if os.path.isdir(candidate):
+            _CGROUP_PATH_CACHE[key] = candidate
+            return candidate
+    return None
+
+
+def _read_cgroup_stats(container_id: str) -> Optional[Dict[str, int]]:
+    """
+    Read CPU and memory counters straight from the cgroup filesystem.
+
+    A sysfs read is a couple of open()/read() syscalls versus the full
+    dockerd -> containerd stats aggregation pipeline. Returns None when
+    the paths aren't readable (non-Linux, rootless, permissions) so the
+    caller falls back to the Docker stats API.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        if os.path.exists("/sys/fs/cgroup/cgroup.controllers"):
+            # cgroup v2 (unified hierarchy)
+            base = _resolve_cgroup_dir(container_id)
+            if base is None:
+                return None
+            with open(os.path.join(base, "memory.current")) as f:
+                memory_usage = int(f.read())
+            with open(os.path.join(base, "memory.max")) as f:
+                raw_limit = f.read().strip()
+            memory_limit = 0 if raw_limit == "max" else int(raw_limit)
+            cpu_total_ns = 0
+            with open(os.path.join(base, "cpu.stat")) as f:
+                for line in f:
+                    if line.startswith("usage_usec"):
+                        cpu_total_ns = int(line.split()[1]) * 1000
+                        break
+        else:
+            # cgroup v1 (per-controller hierarchies)
+            mem_base = _resolve_cgroup_dir(container_id, "memory")
+            cpu_base = _resolve_cgroup_dir(container_id, "cpuacct")
+            if mem_base is None or cpu_base is None:
+                return None
+            with open(os.path.join(mem_base, "memory.usage_in_bytes")) as f:
+                memory_usage = int(f.read())
+            with open(os.path.join(mem_base, "memory.limit_in_bytes")) as f:
+                memory_limit = int(f.read())
+            with open(os.path.join(cpu_base, "cpuacct.usage")) as f:
+                cpu_total_ns = int(f.read())
+        return {
+            "memory_usage": memory_usage,
+            "memory_limit": memory_limit,
+            "cpu_total_ns": cpu_total_ns
+        }
+    except (OSError, ValueError):
+        return None
+
+
+def _read_cgroup_sizing(container_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read peak memory, memory limit and CPU throttling counters straight
+    from the cgroup filesystem for right-sizing checks — everything
+    recommend_resource_limits needs, in a few microsecond syscalls
+    instead of a dockerd stats round-trip. Returns None when the paths
+    aren't readable so the caller falls back to the stats API.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        if os.path.exists("/sys/fs/cgroup/cgroup.controllers"):
+            # cgroup v2 (unified hierarchy)
+            base = _resolve_cgroup_dir(container_id)
+            if base is None:
+                return None
+            with open(os.path.join(base, "memory.current")) as f:
+                memory_usage = int(f.read())
+            try:
+                with open(os.path.join(base, "memory.peak")) as f:
+                    memory_peak = int(f.read())
+            except OSError:
+                # memory.peak needs kernel 5.19+; fall back to the
+                # instantaneous reading
+                memory_peak = memory_usage
+            with open(os.path.join(base, "memory.max")) as f:
+                raw_limit = f.read().strip()
+            memory_limit = 0 if raw_limit == "max" else int(raw_limit)
+            cpu_stat_path = os.path.join(base, "cpu.stat")
+            time_field, time_scale = "throttled_usec", 1000
+        else:
+            # cgroup v1 (per-controller hierarchies)
+            mem_base = _resolve_cgroup_dir(container_id, "memory")
+            cpu_base = _resolve_cgroup_dir(container_id, "cpu")
+            if mem_base is None or cpu_base is None:
+                return None
+            with open(os.path.join(mem_base, "memory.usage_in_bytes")) as f:
+                memory_usage = int(f.read())
+            with open(os.path.join(mem_base, "memory.max_usage_in_bytes")) as f:
+                memory_peak = int(f.read())
+            with open(os.path.join(mem_base, "memory.limit_in_bytes")) as f:
+                memory_limit = int(f.read())
+            # v1 reports "unlimited" as a huge sentinel rather than "max"
+            if memory_limit >= 1 << 62:
+                memory_limit = 0
+            cpu_stat_path = os.path.join(cpu_base, "cpu.stat")
+            time_field, time_scale = "throttled_time", 1
+
+        # Same keys as the Docker API's cpu_stats.throttling_data
+        throttling = {}
+        with open(cpu_stat_path) as f:
+            for line in f:
+                field, _, value = line.partition(" ")
+                if field == "nr_periods":
+                    throttling["periods"] = int(value)
+                elif field == "nr_throttled":
+                    throttling["throttled_periods"] = int(value)
+                elif field == time_field:
+                    throttling["throttled_time"] = int(value) * time_scale
+
+        return {
+            "memory_usage": memory_usage,
+            "memory_peak": memory_peak,
+            "memory_limit": memory_limit,
+            "throttling": throttling
+        }
+    except (OSError, ValueError):
+        return None
+
+
+# Prior (monotonic timestamp, cpu ns) per container for sysfs CPU percent
+_PREV_CGROUP_CPU: Dict[str, tuple] = {}
+
+# Prior CPU counters per container id, so one-shot stats snapshots can be
+# turned into percentages without dockerd's internal 2-sample wait
+_PREV_CPU: Dict[str, tuple] = {}
+_PREV_CPU_MAX = 256
 
 
 @_safe_docker_tool
 async def get_container_stats(container_name: str) -> str:
     """
     Get real-time resource usage statistics for a container.
-    
+
     Args:
         container_name: Name or ID of the container.
-    
+
     Returns:
         JSON string with CPU, memory, network, and I/O statistics.
+        CPU percent is null on the first call for a container; it is
+        computed against the previous snapshot from the second call on.
     """
     logger.info(f"Getting stats for container: {container_name}")
-    
+
     client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
+    container = await _run(client.containers.get, container_name)
+
     if container.status != "running":
-        return json.dumps({
+        return _dumps({
             "status": "warning",
             "message": f"Container '{container_name}' is not running (status: {container.status})",
             "container_status": container.status
-        }, indent=2)
-    
-    # Get one stats sample (stream=False for single snapshot)
-    stats = container.stats(stream=False)
-    
-    # Calculate CPU percentage
-    cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
-                stats["precpu_stats"]["cpu_usage"]["total_usage"]
-    system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
-                   stats["precpu_stats"]["system_cpu_usage"]
-    num_cpus = stats["cpu_stats"].get("online_cpus", 1)
-    
-    cpu_percent = 0.0
-    if system_delta > 0 and cpu_delta > 0:
-        cpu_percent = (cpu_delta / system_delta) * num_cpus * 100.0
-    
-    # Calculate memory usage
-    memory_stats = stats.get("memory_stats", {})
-    memory_usage = memory_stats.get("usage", 0)
-    memory_limit = memory_stats.get("limit", 1)
+        })
+
+    # sysfs-first on Linux: reading cgroup counters is a few syscalls and
+    # skips the dockerd -> containerd stats pipeline entirely
+    cgroup = _read_cgroup_stats(container.id)
+    if cgroup is not None:
+        num_cpus = os.cpu_count() or 1
+        now = time.monotonic()
+        previous = _PREV_CGROUP_CPU.get(container.id)
+        cpu_percent = None
+        if previous:
+            wall_ns = (now - previous[0]) * 1e9
+            if wall_ns > 0:
+                cpu_percent = max((cgroup["cpu_total_ns"] - previous[1]) / wall_ns * 100.0, 0.0)
+        _PREV_CGROUP_CPU[container.id] = (now, cgroup["cpu_total_ns"])
+
+        memory_usage = cgroup["memory_usage"]
+        memory_limit = cgroup["memory_limit"]
+        timestamp = datetime.now(timezone.utc).isoformat()
+        source = "cgroup_sysfs"
+        # Network/blkio aren't exposed per-container in the cgroup tree
+        network_rx = network_tx = block_read = block_write = 0
+    else:
+        source = "docker_api"
+        # Served from the streaming cache once warm (microseconds per read);
+        # falls back to a one-shot snapshot (Docker 20.10+) while the stream
+        # spins up, with CPU deltas from our cached prior counters
+        stats = _STATS_CACHE.get(client, container.id)
+        from_stream = stats is not None
+        if not from_stream:
+            stats = await _run(client.api.stats, container.id, stream=False, one_shot=True)
+
+        cpu_stats = stats.get("cpu_stats", {})
+        cpu_total = cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+        system_cpu = cpu_stats.get("system_cpu_usage", 0)
+        num_cpus = cpu_stats.get("online_cpus", 1)
+
+        if from_stream:
+            # Streamed samples carry the previous counters inline
+            precpu = stats.get("precpu_stats", {})
+            previous = (
+                precpu.get("cpu_usage", {}).get("total_usage", 0),
+                precpu.get("system_cpu_usage", 0)
+            )
+        else:
+            previous = _PREV_CPU.get(container.id)
+
+        cpu_percent = None
+        if previous and previous[1]:
+            cpu_delta = cpu_total - previous[0]
+            system_delta = system_cpu - previous[1]
+            cpu_percent = 0.0
+            if system_delta > 0 and cpu_delta > 0:
+                cpu_percent = (cpu_delta / system_delta) * num_cpus * 100.0
+
+        _PREV_CPU[container.id] = (cpu_total, system_cpu)
+        if len(_PREV_CPU) > _PREV_CPU_MAX:
+            _PREV_CPU.pop(next(iter(_PREV_CPU)))
+
+        # Calculate memory usage
+        memory_stats = stats.get("memory_stats", {})
+        memory_usage = memory_stats.get("usage", 0)
+        memory_limit = memory_stats.get("limit", 1)
+
+        # Network I/O: one pass over the interfaces instead of paired sums
+        network_rx = network_tx = 0
+        for net in stats.get("networks", {}).values():
+            network_rx += net.get("rx_bytes", 0)
+            network_tx += net.get("tx_bytes", 0)
+
+        # Block I/O: one pass over the devices; the op casing differs
+        # between cgroup v1 ("Read") and v2 ("read") hosts
+        block_read = block_write = 0
+        blkio_stats = stats.get("blkio_stats", {}).get("io_service_bytes_recursive", []) or []
+        for item in blkio_stats:
+            op = (item.get("op") or "").lower()
+            if op == "read":
+                block_read += item.get("value", 0)
+            elif op == "write":
+                block_write += item.get("value", 0)
+
+        timestamp = stats.get("read", "")
+
     memory_percent = (memory_usage / memory_limit) * 100.0 if memory_limit > 0 else 0
-    
-    # Network I/O
-    networks = stats.get("networks", {})
-    network_rx = sum(net.get("rx_bytes", 0) for net in networks.values())
-    network_tx = sum(net.get("tx_bytes", 0) for net in networks.values())
-    
-    # Block I/O
-    blkio_stats = stats.get("blkio_stats", {}).get("io_service_bytes_recursive", []) or []
-    block_read = sum(item.get("value", 0) for item in blkio_stats if item.get("op") == "read")
-    block_write = sum(item.get("value", 0) for item in blkio_stats if item.get("op") == "write")
-    
+
     result = {
         "status": "success",
         "container": container_name,
-        "timestamp": stats.get("read", ""),
+        "source": source,
+        "timestamp": timestamp,
         "cpu": {
-            "percent": round(cpu_percent, 2),
-            "online_cpus": num_cpus
+            "percent": round(cpu_percent, 2) if cpu_percent is not None else None,
+            "online_cpus": num_cpus,
+            "note": None if cpu_percent is not None else "First snapshot for this container; call again for CPU percent."
         },
         "memory": {
             "usage_bytes": memory_usage,
@@ -469,114 +1028,221 @@ async def get_container_stats(container_name: str) -> str:
         }
     }
     
-    logger.info(f"Stats retrieved: CPU={cpu_percent:.1f}%, MEM={memory_percent:.1f}%")
-    return json.dumps(result, indent=2)
+    logger.info(f"Stats retrieved: CPU={cpu_percent if cpu_percent is not None else 'n/a'}, MEM={memory_percent:.1f}%")
+    return _dumps(result)
+
+
+@_safe_docker_tool
+async def get_all_container_stats() -> str:
+    """
+    Get resource usage statistics for ALL running containers at once.
+
+    Snapshots are fetched concurrently with one-shot sampling, so the call
+    costs roughly one Docker round-trip instead of N sequential 2-second
+    samples. CPU percent is null for containers seen for the first time.
+
+    Returns:
+        JSON string with per-container CPU and memory usage.
+    """
+    logger.info("Getting stats for all running containers")
+
+    client = _get_docker_client()
+    containers = await _run(client.containers.list, sparse=True)
+
+    semaphore = asyncio.Semaphore(16)
+
+    async def _one(container):
+        name = (container.attrs.get("Names") or ["/" + container.short_id])[0].lstrip("/")
+        async with semaphore:
+            stats = await _run(client.api.stats, container.id, stream=False, one_shot=True)
+
+        cpu_stats = stats.get("cpu_stats", {})
+        cpu_total = cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+        system_cpu = cpu_stats.get("system_cpu_usage", 0)
+        num_cpus = cpu_stats.get("online_cpus", 1)
+
+        cpu_percent = None
+        previous = _PREV_CPU.get(container.id)
+        if previous and previous[1]:
+            cpu_delta = cpu_total - previous[0]
+            system_delta = system_cpu - previous[1]
+            cpu_percent = 0.0
+            if system_delta > 0 and cpu_delta > 0:
+                cpu_percent = round((cpu_delta / system_delta) * num_cpus * 100.0, 2)
+        _PREV_CPU[container.id] = (cpu_total, system_cpu)
+
+        memory_stats = stats.get("memory_stats", {})
+        memory_usage = memory_stats.get("usage", 0)
+        memory_limit = memory_stats.get("limit", 1)
+
+        return {
+            "name": name,
+            "id": container.short_id,
+            "cpu_percent": cpu_percent,
+            "memory_usage_mb": round(memory_usage / (1024 * 1024), 2),
+            "memory_limit_mb": round(memory_limit / (1024 * 1024), 2),
+            "memory_percent": round((memory_usage / memory_limit) * 100.0, 2) if memory_limit > 0 else 0
+        }
+
+    results = await asyncio.gather(
+        *(_one(container) for container in containers),
+        return_exceptions=True
+    )
+
+    stats_list = []
+    errors = []
+    for container, result in zip(containers, results):
+        if isinstance(result, BaseException):
+            errors.append({"id": container.short_id, "error": str(result)})
+        else:
+            stats_list.append(result)
+
+    logger.info(f"Collected stats for {len(stats_list)} containers ({len(errors)} failed)")
+    return _dumps({
+        "status": "success",
+        "count": len(stats_list),
+        "containers": stats_list,
+        "errors": errors
+    })
 
 
 @_safe_docker_tool
 async def restart_container(
     container_name: str,
-    timeout: int = 10
+    timeout: int = 10,
+    verify: bool = False
 ) -> str:
     """
     Restart a Docker container.
-    
+
     Args:
         container_name: Name or ID of the container to restart.
         timeout: Seconds to wait before killing the container (default: 10).
-    
+        verify: If True, re-inspect the container after the restart instead
+                of trusting the API success response (default: False).
+
     Returns:
         JSON string with the result of the restart operation.
     """
     logger.info(f"Restarting container: {container_name}")
-    
+
     client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
+    container = await _run(client.containers.get, container_name)
+
     previous_status = container.status
-    container.restart(timeout=timeout)
-    container.reload()
-    
-    return json.dumps({
+    await _run(container.restart, timeout=timeout)
+
+    if verify:
+        state = await _run(client.api.inspect_container, container.id)
+        current_status = state.get("State", {}).get("Status", "unknown")
+    else:
+        # A successful restart POST is authoritative; skip the extra inspect
+        current_status = "running"
+
+    return _dumps({
         "status": "success",
         "action": "restart",
         "container": container_name,
         "previous_status": previous_status,
-        "current_status": container.status,
+        "current_status": current_status,
         "message": f"Container '{container_name}' restarted successfully"
-    }, indent=2)
+    })
 
 
-@_safe_docker_tool
-async def analyze_all_container_errors(
-    include_healthy: bool = False,
-    tail_per_container: int = 100
-) -> str:
+async def iter_container_error_analyses(tail_per_container: int = 100):
     """
-    Scan ALL containers for errors and provide a consolidated report.
-    Perfect for getting a quick overview of system health.
-    
-    Args:
-        include_healthy: If True, include containers with no errors (default: False).
-        tail_per_container: Number of log lines to analyze per container (default: 100).
-    
-    Returns:
-        JSON string with a consolidated error report across all containers,
-        sorted by severity.
+    Yield per-container error analyses as they complete.
+
+    Async-generator building block for consolidated reports: results
+    arrive in completion order (asyncio.as_completed), so a consumer
+    sees its first container after one per-container latency instead of
+    waiting for the slowest of the whole host. Each item is
+    {"container": summary, "issues": [...]}; failed analyses are logged
+    and skipped.
     """
-    logger.info("Analyzing errors across all containers")
-    
+    tail_per_container = _clamp_tail(tail_per_container)
     client = _get_docker_client()
-    containers = client.containers.list(all=True)
-    
-    all_issues = []
-    healthy_containers = []
-    
-    for container in containers:
+    # Sparse list: one summary call, no per-container inspect; only suspect
+    # containers pay for a reload below
+    containers = await _run(client.containers.list, all=True, sparse=True)
+
+    # Resolve digest-only image references with one images.list call
+    # instead of an image inspect per container
+    tag_map = {}
+    if any((c.attrs.get("Image") or "").startswith("sha256:") for c in containers):
+        tag_map = await _run(_image_tag_map, client)
+
+    # Cap concurrent daemon requests so a large host doesn't get hammered
+    semaphore = asyncio.Semaphore(16)
+
+    async def _analyze_one(container):
+        attrs = container.attrs
+        name = (attrs.get("Names") or ["/" + container.short_id])[0].lstrip("/")
+        image_ref = attrs.get("Image", "")
+        if image_ref.startswith("sha256:"):
+            image_ref = tag_map.get(attrs.get("ImageID", ""), _pretty_image(image_ref))
         container_summary = {
-            "name": container.name,
+            "name": name,
             "status": container.status,
-            "image": container.image.tags[0] if container.image.tags else container.image.short_id
+            "image": image_ref
         }
-        
+
         # Check for obvious issues
         issues = []
-        
+
+        state = {}
+        restart_count = 0
+
         # Container not running
         if container.status != "running":
-            exit_code = container.attrs.get("State", {}).get("ExitCode", 0)
+            # Suspect: fetch the full inspect payload for exit/OOM details
+            await _run(container.reload)
+            attrs = container.attrs
+            state = attrs.get("State", {})
+            restart_count = attrs.get("RestartCount", 0)
+            exit_code = state.get("ExitCode", 0)
+            severity = "high" if exit_code != 0 else "medium"
             issues.append({
                 "type": "container_not_running",
-                "severity": "high" if exit_code != 0 else "medium",
+                "severity": severity,
+                "severity_rank": _SEV_RANK[severity],
                 "message": f"Container is {container.status}" + (f" (exit code: {exit_code})" if exit_code else ""),
                 "recommendation": "Check container logs and restart if needed."
             })
-        
+
         # OOM killed
-        if container.attrs.get("State", {}).get("OOMKilled", False):
+        if state.get("OOMKilled", False):
             issues.append({
                 "type": "oom_killed",
                 "severity": "critical",
+                "severity_rank": _SEV_RANK["critical"],
                 "message": "Container was killed due to Out of Memory",
                 "recommendation": "Increase container memory limits in docker-compose.yml"
             })
-        
+
         # High restart count
-        restart_count = container.attrs.get("RestartCount", 0)
         if restart_count > 5:
             issues.append({
                 "type": "restart_loop",
                 "severity": "high",
+                "severity_rank": _SEV_RANK["high"],
                 "message": f"Container has restarted {restart_count} times",
                 "recommendation": "Container may be in a crash loop. Check application errors."
             })
-        
+
         # Analyze logs for running or recently stopped containers
         if container.status in ["running", "exited", "restarting"]:
             try:
-                logs = container.logs(tail=tail_per_container, timestamps=True).decode("utf-8", errors="replace")
-                log_errors = _analyze_log_errors(logs)
-                
+                async with semaphore:
+                    # This path never surfaces timestamps, so don't make
+                    # dockerd prepend (and this process strip) one per line
+                    log_errors = await _run(
+                        lambda: _analyze_log_errors(
+                            _iter_log_lines(container, tail=tail_per_container, timestamps=False),
+                            timestamps=False
+                        )
+                    )
+
                 # Add unique error types from logs
                 error_types_seen = set()
                 for error in log_errors[:5]:  # Limit to 5 errors per container
@@ -584,37 +1250,60 @@ async def analyze_all_container_errors(
                         issues.append({
                             "type": error["error_type"],
                             "severity": error["severity"],
+                            "severity_rank": error["severity_rank"],
                             "message": error["log_line"][:100],
                             "recommendation": error["recommendation"]
                         })
                         error_types_seen.add(error["error_type"])
             except Exception as e:
-                logger.warning(f"Could not analyze logs for {container.name}: {e}")
-        
+                logger.warning(f"Could not analyze logs for {name}: {e}")
+
+        return container_summary, issues
+
+    for task in asyncio.as_completed([_analyze_one(container) for container in containers]):
+        try:
+            container_summary, issues = await task
+        except Exception as e:
+            logger.warning(f"Container analysis failed: {e}")
+            continue
+        yield {"container": container_summary, "issues": issues}
+
+
+async def _analyze_all_container_errors(
+    include_healthy: bool = False,
+    tail_per_container: int = 100
+) -> Dict[str, Any]:
+    """Dict-returning core of analyze_all_container_errors for in-process callers."""
+    logger.info("Analyzing errors across all containers")
+
+    all_issues = []
+    healthy_containers = []
+    total_containers = 0
+
+    async for item in iter_container_error_analyses(tail_per_container):
+        total_containers += 1
+        issues = item["issues"]
         if issues:
             all_issues.append({
-                "container": container_summary,
+                "container": item["container"],
                 "issues": issues,
                 "issue_count": len(issues),
-                "max_severity": max(
-                    ["low", "medium", "high", "critical"].index(i["severity"]) 
-                    for i in issues
-                )
+                "max_severity": max(i["severity_rank"] for i in issues)
             })
         else:
-            healthy_containers.append(container_summary)
-    
+            healthy_containers.append(item["container"])
+
     # Sort by severity (highest first)
     all_issues.sort(key=lambda x: x["max_severity"], reverse=True)
-    
+
     # Summary stats
     total_issues = sum(c["issue_count"] for c in all_issues)
     critical_containers = len([c for c in all_issues if c["max_severity"] >= 3])
-    
+
     result = {
         "status": "success",
         "summary": {
-            "total_containers": len(containers),
+            "total_containers": total_containers,
             "containers_with_issues": len(all_issues),
             "healthy_containers": len(healthy_containers),
             "total_issues": total_issues,
@@ -622,12 +1311,32 @@ async def analyze_all_container_errors(
         },
         "containers_with_issues": all_issues,
     }
-    
+
     if include_healthy:
         result["healthy_containers"] = healthy_containers
-    
+
     logger.info(f"Analysis complete: {len(all_issues)} containers with issues, {total_issues} total issues")
-    return json.dumps(result, indent=2)
+    return result
+
+
+@_safe_docker_tool
+async def analyze_all_container_errors(
+    include_healthy: bool = False,
+    tail_per_container: int = 100
+) -> str:
+    """
+    Scan ALL containers for errors and provide a consolidated report.
+    Perfect for getting a quick overview of system health.
+
+    Args:
+        include_healthy: If True, include containers with no errors (default: False).
+        tail_per_container: Number of log lines to analyze per container (default: 100).
+
+    Returns:
+        JSON string with a consolidated error report across all containers,
+        sorted by severity.
+    """
+    return _dumps(await _analyze_all_container_errors(include_healthy, tail_per_container))
 
 
 @_safe_docker_tool
@@ -642,23 +1351,25 @@ async def get_container_inspect(container_name: str) -> str:
         JSON string with detailed container configuration.
     """
     logger.info(f"Inspecting container: {container_name}")
-    
-    client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
-    attrs = container.attrs
-    
-    # Extract key information
-    config = attrs.get("Config", {})
-    host_config = attrs.get("HostConfig", {})
-    network_settings = attrs.get("NetworkSettings", {})
-    state = attrs.get("State", {})
-    
-    inspection = {
-        "status": "success",
+
+    client = _get_docker_client()
+    attrs = await _run(client.api.inspect_container, container_name)
+
+    inspection = {"status": "success", **_project_inspect(attrs)}
+    return _dumps(inspection)
+
+
+def _project_inspect(attrs: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a raw inspect payload down to the fields the tools report."""
+    config = attrs.get("Config") or {}
+    host_config = attrs.get("HostConfig") or {}
+    network_settings = attrs.get("NetworkSettings") or {}
+    state = attrs.get("State") or {}
+
+    return {
         "container": {
-            "id": container.id,
-            "name": container.name,
+            "id": attrs.get("Id", ""),
+            "name": (attrs.get("Name") or "").lstrip("/"),
             "image": config.get("Image", ""),
             "created": attrs.get("Created", ""),
         },
@@ -708,9 +1419,94 @@ async def get_container_inspect(container_name: str) -> str:
             for name, net in network_settings.get("Networks", {}).items()
         }
     }
-    
-    logger.info(f"Inspection complete for: {container_name}")
-    return json.dumps(inspection, indent=2)
+
+
+@_safe_docker_tool
+async def get_container_inspect_bulk(container_names: List[str]) -> str:
+    """
+    Inspect several containers at once.
+
+    Docker has no batch inspect endpoint, so the inspects are fanned out
+    concurrently over the shared connection pool instead of paying one
+    round-trip of latency per container.
+
+    Args:
+        container_names: Names or IDs of the containers to inspect.
+
+    Returns:
+        JSON string mapping each requested name to its inspection (or an
+        error entry for containers that could not be inspected).
+    """
+    logger.info(f"Inspecting {len(container_names)} containers")
+
+    client = _get_docker_client()
+    raws = await asyncio.gather(
+        *(_run(client.api.inspect_container, name) for name in container_names),
+        return_exceptions=True
+    )
+
+    inspections = {}
+    errors = {}
+    for name, raw in zip(container_names, raws):
+        if isinstance(raw, BaseException):
+            errors[name] = str(raw)
+        else:
+            inspections[name] = _project_inspect(raw)
+
+    result = {
+        "status": "success",
+        "count": len(inspections),
+        "inspections": inspections
+    }
+    if errors:
+        result["errors"] = errors
+    return _dumps(result)
+
+
+class _ChunkStream(io.RawIOBase):
+    """File-like adapter over the chunk generator returned by get_archive."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        n = min(len(target), len(self._buffer))
+        target[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def _list_archive_members(container, path: str, limit: int = 1000) -> List[Dict[str, Any]]:
+    """List tar members of a container path via the archive API (no exec)."""
+    bits, _ = container.get_archive(path)
+    files = []
+    with tarfile.open(fileobj=io.BufferedReader(_ChunkStream(bits)), mode="r|") as tar:
+        for member in tar:
+            if member.isdir():
+                type_bits = stat.S_IFDIR
+            elif member.issym():
+                type_bits = stat.S_IFLNK
+            else:
+                type_bits = stat.S_IFREG
+            files.append({
+                "permissions": stat.filemode(type_bits | member.mode),
+                "owner": member.uname or str(member.uid),
+                "group": member.gname or str(member.gid),
+                "size": member.size,
+                "name": member.name
+            })
+            if len(files) >= limit:
+                break
+    return files
 
 
 @_safe_docker_tool
@@ -720,45 +1516,22 @@ async def list_container_files(
 ) -> str:
     """
     List files and directories inside a container.
+    Uses the archive API, so it works on images without a shell or ls
+    (scratch/distroless) and handles names with spaces correctly.
     """
     logger.info(f"Listing files in {container_name} at {path}")
-    
+
     client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
-    # Use ls -la to get details
-    exec_result = container.exec_run(["ls", "-la", path])
-    
-    if exec_result.exit_code != 0:
-        return json.dumps({
-            "status": "error",
-            "exit_code": exec_result.exit_code,
-            "output": exec_result.output.decode("utf-8", errors="replace")
-        }, indent=2)
-        
-    output = exec_result.output.decode("utf-8", errors="replace")
-    
-    # Parse generic ls -la output to structured JSON (basic parsing)
-    lines = output.strip().split('\n')
-    files = []
-    for line in lines[1:]: # Skip total header
-        parts = re.split(r'\s+', line.strip())
-        if len(parts) >= 9:
-            files.append({
-                "permissions": parts[0],
-                "owner": parts[2],
-                "group": parts[3],
-                "size": parts[4],
-                "name": " ".join(parts[8:])
-            })
-            
-    return json.dumps({
+    container = await _run(_container_ref, client, container_name)
+
+    files = await _run(_list_archive_members, container, path)
+
+    return _dumps({
         "status": "success",
         "container": container_name,
         "path": path,
-        "files": files,
-        "raw_output": output
-    }, indent=2)
+        "files": files
+    })
 
 
 @_safe_docker_tool
@@ -772,24 +1545,24 @@ async def read_container_file(
     logger.info(f"Reading file {path} from {container_name}")
     
     client = _get_docker_client()
-    container = client.containers.get(container_name)
+    container = await _run(_container_ref, client, container_name)
     
     # Use cat to read file
     exec_result = container.exec_run(["cat", path])
     
     if exec_result.exit_code != 0:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "exit_code": exec_result.exit_code,
             "output": exec_result.output.decode("utf-8", errors="replace")
-        }, indent=2)
+        })
         
-    return json.dumps({
+    return _dumps({
         "status": "success",
         "container": container_name,
         "path": path,
         "content": exec_result.output.decode("utf-8", errors="replace")
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -804,15 +1577,15 @@ async def run_container_command(
     logger.info(f"Executing command in {container_name}: {command}")
     
     client = _get_docker_client()
-    container = client.containers.get(container_name)
+    container = await _run(_container_ref, client, container_name)
     
     exec_result = container.exec_run(command, user=user)
     
-    return json.dumps({
+    return _dumps({
         "status": "success" if exec_result.exit_code == 0 else "error",
         "exit_code": exec_result.exit_code,
         "output": exec_result.output.decode("utf-8", errors="replace")
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -829,7 +1602,7 @@ async def run_sql_in_container(
     logger.info(f"Running SQL in {container_name} ({db_type}): {query}")
     
     client = _get_docker_client()
-    container = client.containers.get(container_name)
+    container = await _run(_container_ref, client, container_name)
     
     command = []
     if db_type.lower() == "postgres":
@@ -837,19 +1610,19 @@ async def run_sql_in_container(
     elif db_type.lower() == "mysql":
          command = ["mysql", "-u", db_user, f"-p{db_user}", "-D", db_name, "-e", query] # Note: simplistic password assumption
     else:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "message": f"Unsupported database type: {db_type}"
-        }, indent=2)
+        })
         
     exec_result = container.exec_run(command)
     
-    return json.dumps({
+    return _dumps({
         "status": "success" if exec_result.exit_code == 0 else "error",
         "exit_code": exec_result.exit_code,
         "query": query,
         "output": exec_result.output.decode("utf-8", errors="replace")
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -863,27 +1636,17 @@ async def prune_docker_images(
     logger.info(f"Pruning images (older_than={older_than_days}d, dry_run={dry_run})")
     
     client = _get_docker_client()
-    images = client.images.list()
-    
+    images = await _run(client.images.list)
+
     candidates = []
-    cutoff_date = datetime.now().astimezone() - timedelta(days=older_than_days)
-    
-    # Need to handle timezone parsing carefully from Docker strings
-    # Usually '2025-01-04T10:31:54.123456789Z'
-    # Simplified parsing for this example
-    
+    # Docker reports Created as RFC3339 UTC ('2025-01-04T10:31:54.123456789Z'),
+    # which sorts lexicographically, so the age check is a plain string
+    # comparison on the seconds prefix — no per-image datetime parsing
+    cutoff_iso = (datetime.now(timezone.utc) - timedelta(days=older_than_days)).strftime("%Y-%m-%dT%H:%M:%S")
+
     for img in images:
-        created_str = img.attrs.get("Created")
-        try:
-             # Basic ISO 8601 parsing, removing fractional seconds for simplicity if needed
-             # or using a library. Docker format is usually ISO.
-             # Python 3.11+ checks
-             from dateutil.parser import parse # fallback or simple
-             created_dt = parse(created_str)
-        except:
-             continue # Skip if cant parse
-             
-        if created_dt < cutoff_date:
+        created_str = img.attrs.get("Created") or ""
+        if created_str and created_str[:19] < cutoff_iso:
              candidates.append({
                  "id": img.id,
                  "tags": img.tags,
@@ -892,29 +1655,29 @@ async def prune_docker_images(
              })
 
     if dry_run:
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "mode": "dry_run",
             "candidate_count": len(candidates),
             "candidates": candidates,
             "message": "Set dry_run=False to actually delete these images."
-        }, indent=2)
+        })
         
     deleted = []
     errors = []
     for cand in candidates:
         try:
-            client.images.remove(channel=cand["id"]) # or just image=cand['id']
+            await _run(client.images.remove, image=cand["id"])
             deleted.append(cand["id"])
         except Exception as e:
             errors.append({"id": cand["id"], "error": str(e)})
 
-    return json.dumps({
+    return _dumps({
         "status": "success",
         "deleted_count": len(deleted),
         "deleted": deleted,
         "errors": errors
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -934,54 +1697,54 @@ async def check_container_connection(
     logger.info(f"Checking connection: {source_container} -> {target}:{port}")
     
     client = _get_docker_client()
-    container = client.containers.get(source_container)
-    
-    # Try using nc (netcat) first, then curl, then bash /dev/tcp
-    # This ensures it works on most images (alpine, debian, etc)
+    container = await _run(_container_ref, client, source_container)
     
-    # 1. Try nc (most robust)
-    cmd_nc = f"nc -zv -w 3 {target} {port}"
-    res_nc = container.exec_run(["sh", "-c", cmd_nc])
-    
-    if res_nc.exit_code == 0:
-        return json.dumps({
-            "status": "success",
-            "connected": True,
-            "method": "nc",
-            "output": res_nc.output.decode("utf-8")
-        }, indent=2)
-
-    # 2. Try curl (if http/https port)
+    # Multiple runners (nc, curl, bash /dev/tcp) keep this working across
+    # alpine/debian/etc. Each exec costs an exec-create + exec-start
+    # round-trip, so fire them all at once and answer on the first success
+    # instead of trying them in sequence.
+    probes = {"nc": f"nc -zv -w 3 {target} {port}"}
     if port in [80, 443, 8080, 3000, 5678]:
         protocol = "https" if port == 443 else "http"
-        cmd_curl = f"curl -I --connect-timeout 3 {protocol}://{target}:{port}"
-        res_curl = container.exec_run(["sh", "-c", cmd_curl])
-        if res_curl.exit_code == 0:
-             return json.dumps({
-                "status": "success",
-                "connected": True,
-                "method": "curl",
-                "output": res_curl.output.decode("utf-8")
-            }, indent=2)
-
-    # 3. Last resort: internal bash /dev/tcp (if bash exists)
-    cmd_bash = f"timeout 3 bash -c '</dev/tcp/{target}/{port}'"
-    res_bash = container.exec_run(["sh", "-c", cmd_bash])
-    
-    if res_bash.exit_code == 0:
-         return json.dumps({
-            "status": "success",
-            "connected": True,
-            "method": "bash_dev_tcp",
-            "output": "Connection established via /dev/tcp"
-        }, indent=2)
-        
-    return json.dumps({
+        probes["curl"] = f"curl -I --connect-timeout 3 {protocol}://{target}:{port}"
+    probes["bash_dev_tcp"] = f"timeout 3 bash -c '</dev/tcp/{target}/{port}'"
+
+    tasks = {
+        asyncio.ensure_future(_run(container.exec_run, ["sh", "-c", cmd])): name
+        for name, cmd in probes.items()
+    }
+
+    failures = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                try:
+                    res = task.result()
+                except Exception as exc:
+                    failures[name] = str(exc)
+                    continue
+                if res.exit_code == 0:
+                    return _dumps({
+                        "status": "success",
+                        "connected": True,
+                        "method": name,
+                        "output": res.output.decode("utf-8", errors="replace")
+                    })
+                failures[name] = res.output.decode("utf-8", errors="replace")
+    finally:
+        # A probe won, or all failed: drop whatever is still in flight
+        for task in pending:
+            task.cancel()
+
+    return _dumps({
         "status": "error",
         "connected": False,
         "message": f"Could not connect to {target}:{port}",
-        "details": res_nc.output.decode("utf-8") or res_bash.output.decode("utf-8")
-    }, indent=2)
+        "details": failures
+    })
 
 
 @_safe_docker_tool
@@ -992,27 +1755,110 @@ async def inspect_container_dns(container_name: str) -> str:
     logger.info(f"Inspecting DNS for {container_name}")
     
     client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
-    # Read resolv.conf
-    res_resolv = container.exec_run(["cat", "/etc/resolv.conf"])
-    resolv_conf = res_resolv.output.decode("utf-8")
+    container = await _run(_container_ref, client, container_name)
     
-    # Try to resolve key internal hosts
+    # One exec round-trip instead of one per probe: read resolv.conf and
+    # run all resolutions in a single sh -c script with delimited output,
+    # parsed client-side. getent hosts is standard in most linux distros.
     test_hosts = ["host.docker.internal", "google.com", "postgres", "n8n"]
+    script = (
+        "cat /etc/resolv.conf 2>/dev/null; "
+        + "".join(
+            f'echo "---{host}---"; getent hosts "{host}" || echo __FAIL__; '
+            for host in test_hosts
+        )
+    )
+    res = await _run(container.exec_run, ["sh", "-c", script])
+    output = res.output.decode("utf-8", errors="replace")
+
+    resolv_conf, *blocks = re.split(r"---(?:%s)---\n" % "|".join(map(re.escape, test_hosts)), output)
     resolution_results = {}
-    
-    for host in test_hosts:
-        # getent hosts is standard in most linux distros
-        res = container.exec_run(["getent", "hosts", host])
-        resolution_results[host] = "Resolved: " + res.output.decode("utf-8").strip() if res.exit_code == 0 else "Failed to resolve"
-        
-    return json.dumps({
+    for host, block in zip(test_hosts, blocks):
+        block = block.strip()
+        if not block or block == "__FAIL__":
+            resolution_results[host] = "Failed to resolve"
+        else:
+            resolution_results[host] = "Resolved: " + block
+
+
+    return _dumps({
         "status": "success",
         "container": container_name,
         "resolv_conf": resolv_conf,
         "resolutions": resolution_results
-    }, indent=2)
+    })
+
+
+# Docker Hub lookups: a shared keep-alive session so repeated tag audits
+# reuse one TLS connection, plus a short TTL cache so auditing many local
+# tags hits each repo endpoint at most once per window
+_HUB_CACHE: Dict[str, tuple] = {}
+_HUB_CACHE_TTL = 600.0
+_HUB_SESSION = None
+_HUB_LOCK = threading.Lock()
+
+
+def _hub_session():
+    """Shared keep-alive session for all Docker Hub traffic."""
+    import requests
+
+    global _HUB_SESSION
+    with _HUB_LOCK:
+        if _HUB_SESSION is None:
+            from urllib3.util.retry import Retry
+
+            _HUB_SESSION = requests.Session()
+            _HUB_SESSION.mount("https://", requests.adapters.HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=32,
+                max_retries=Retry(total=2, backoff_factor=0.2)
+            ))
+    return _HUB_SESSION
+
+
+def _hub_get_tag(repo: str, tag: str):
+    """
+    Fetch tag metadata from Docker Hub.
+
+    Returns (status_code, data); data is None on a non-200 response.
+    Successful responses are cached for _HUB_CACHE_TTL seconds.
+    """
+    key = f"{repo}:{tag}"
+    now = time.time()
+    entry = _HUB_CACHE.get(key)
+    if entry and now - entry[0] < _HUB_CACHE_TTL:
+        return 200, entry[1]
+
+    url = f"https://hub.docker.com/v2/repositories/{repo}/tags/{tag}"
+    resp = _hub_session().get(url, timeout=5)
+    if resp.status_code != 200:
+        return resp.status_code, None
+    data = resp.json()
+    _HUB_CACHE[key] = (now, data)
+    return 200, data
+
+
+def _hub_list_tags(repo: str):
+    """
+    List tag names for a repo from Docker Hub (one page at the maximum
+    page_size of 100, up from the old default-sized request).
+
+    Returns (status_code, names); names is None on a non-200 response.
+    Successful responses are cached for _HUB_CACHE_TTL seconds.
+    """
+    key = f"tags:{repo}"
+    now = time.time()
+    entry = _HUB_CACHE.get(key)
+    if entry and now - entry[0] < _HUB_CACHE_TTL:
+        return 200, entry[1]
+
+    url = f"https://hub.docker.com/v2/repositories/{repo}/tags"
+    resp = _hub_session().get(url, params={"page_size": 100}, timeout=5)
+    if resp.status_code != 200:
+        return resp.status_code, None
+    names = [t["name"] for t in resp.json().get("results", [])]
+    _HUB_CACHE[key] = (now, names)
+    return 200, names
 
 
 @_safe_docker_tool
@@ -1023,10 +1869,10 @@ async def audit_image_freshness(image_name: str) -> str:
     """
     logger.info(f"Auditing image freshness: {image_name}")
     try:
-        import requests
+        import requests  # noqa: F401 - availability check only
     except ImportError:
-        return json.dumps({"status": "error", "message": "requests library not installed"}, indent=2)
-        
+        return _dumps({"status": "error", "message": "requests library not installed"})
+
     client = _get_docker_client()
     
     try:
@@ -1041,43 +1887,60 @@ async def audit_image_freshness(image_name: str) -> str:
             repo = f"library/{repo}"
             
         # Get local image info
-        local_img = client.images.get(f"{repo}:{tag}")
+        local_img = await _run(client.images.get, f"{repo}:{tag}")
         local_created = local_img.attrs.get("Created")
         local_id = local_img.id
         
-        # Query Docker Hub API
+        # Query Docker Hub API (cached, shared session)
         # Only works for public images currently
-        url = f"https://hub.docker.com/v2/repositories/{repo}/tags/{tag}"
-        resp = requests.get(url, timeout=5)
-        
-        if resp.status_code != 200:
-             return json.dumps({
+        status_code, remote_data = await _run(_hub_get_tag, repo, tag)
+
+        if remote_data is None:
+             return _dumps({
                 "status": "warning",
-                "message": f"Could not check Docker Hub for {repo}:{tag}. Status: {resp.status_code}",
+                "message": f"Could not check Docker Hub for {repo}:{tag}. Status: {status_code}",
                 "local_created": local_created
-            }, indent=2)
-            
-        remote_data = resp.json()
+            })
+
         remote_last_updated = remote_data.get("last_updated")
         
         # Simple date string comparison (ISO format usually sorts correctly)
         # Ideally parsing via dateutil
         is_stale = local_created < remote_last_updated if local_created and remote_last_updated else False
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "image": f"{repo}:{tag}",
             "is_outdated": is_stale,
             "local_created": local_created,
             "remote_last_updated": remote_last_updated,
             "recommendation": "Pull the latest image (`docker pull ...`) and recreate the container." if is_stale else "Image works but verify exact hash if in doubt."
-        }, indent=2)
+        })
         
     except Exception as e:
-         return json.dumps({
+         return _dumps({
             "status": "error",
             "message": f"Failed to audit image: {str(e)}"
-        }, indent=2)
+        })
+
+
+def _volume_holder(client, volume_name: str, mode: str):
+    """
+    Create (never start) a minimal container whose only job is to hold a
+    volume mount for the archive API. No process runs, so the cost is a
+    create/remove pair instead of a full container start/stop.
+    """
+    kwargs = {
+        "image": "alpine:latest",
+        "command": "true",
+        "volumes": {volume_name: {"bind": "/data", "mode": mode}}
+    }
+    try:
+        return client.containers.create(**kwargs)
+    except NotFound:
+        # create() doesn't pull; fetch the image once and retry
+        client.images.pull("alpine", tag="latest")
+        return client.containers.create(**kwargs)
 
 
 @_safe_docker_tool
@@ -1093,83 +1956,122 @@ async def backup_volume_to_host(
     client = _get_docker_client()
     
     # Validate path (must be absolute)
-    import os
     if not os.path.isabs(backup_path):
-         return json.dumps({"status": "error", "message": "Backup path must be absolute"}, indent=2)
-         
+         return _dumps({"status": "error", "message": "Backup path must be absolute"})
+
     backup_dir = os.path.dirname(backup_path)
-    backup_file = os.path.basename(backup_path)
-    
+
     if not os.path.exists(backup_dir):
-        return json.dumps({"status": "error", "message": f"Directory does not exist: {backup_dir}"}, indent=2)
+        return _dumps({"status": "error", "message": f"Directory does not exist: {backup_dir}"})
+
+    # Stream the volume through the archive API instead of running tar in
+    # a helper container: a created (never started) container only exists
+    # to hold the mount, so there is no process start/stop in the path and
+    # the tar bytes flow through host memory in fixed-size chunks
+    def _backup():
+        helper = _volume_holder(client, volume_name, mode="ro")
+        try:
+            bits, _ = helper.get_archive("/data")
+            with gzip.open(backup_path, "wb") as out:
+                for chunk in bits:
+                    out.write(chunk)
+        finally:
+            helper.remove(force=True)
 
-    # Use a helper alpine container to mount the volume and tar it
-    # Mapping host dir allows writing directly to host
     try:
-        # This blocks until finished
-        logs = client.containers.run(
-            image="alpine:latest",
-            command=f"tar czf /backup/{backup_file} -C /data .",
-            volumes={
-                volume_name: {'bind': '/data', 'mode': 'ro'},
-                backup_dir: {'bind': '/backup', 'mode': 'rw'}
-            },
-            remove=True
-        )
-        
-        return json.dumps({
+        await _run(_backup)
+
+        return _dumps({
             "status": "success",
             "message": "Backup created successfully",
             "volume": volume_name,
             "backup_path": backup_path
-        }, indent=2)
-        
+        })
+
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "message": f"Backup failed: {str(e)}"
-        }, indent=2)
+        })
 
 
 @_safe_docker_tool
 async def grep_log_across_containers(
     pattern: str,
-    since_minutes: int = 60
+    since_minutes: int = 60,
+    max_lines_per_container: int = 100000,
+    max_matches: int = 100
 ) -> str:
     """
     Search for a regex pattern in the logs of ALL running containers.
+
+    Args:
+        pattern: Regex (or literal substring) to search for.
+        since_minutes: How far back to search.
+        max_lines_per_container: dockerd-side tail cap per container, so a
+            chatty container can't turn the search into a multi-GB pull.
+        max_matches: Stop scanning a container once it has this many hits;
+            breaking out early closes the log stream, cancelling the
+            daemon's transfer.
     """
     logger.info(f"Grepping logs for '{pattern}' (last {since_minutes}m)")
-    
+
     client = _get_docker_client()
-    containers = client.containers.list(filters={"status": "running"})
-    
-    matches = []
-    
-    for container in containers:
-        try:
-            # Grab recent logs
-            # Note: We get raw bytes, need to decode
-            log_output = container.logs(
-                since=datetime.utcnow() - timedelta(minutes=since_minutes),
-                timestamps=True
-            ).decode("utf-8", errors="replace")
-            
-            for line in log_output.splitlines():
-                if re.search(pattern, line, re.IGNORECASE):
-                    matches.append({
-                        "container": container.name,
-                        "log": line[:200] # Truncate for sanity
+    containers = await _run(client.containers.list, sparse=True, filters={"status": "running"})
+
+    match = _compile_bytes_matcher(pattern)
+    since = int(time.time()) - since_minutes * 60
+    # Each logs() call is a blocking round-trip to dockerd; fan them out
+    # so wall time approaches the slowest container instead of the sum,
+    # capped so a large host doesn't get hammered
+    semaphore = asyncio.Semaphore(16)
+
+    async def _grep_one(container):
+        name = (container.attrs.get("Names") or ["/" + container.short_id])[0].lstrip("/")
+        found = []
+
+        def _scan():
+            # No timestamps: the report shows the raw line only, and the
+            # prefix would roughly double bytes on the wire for short lines
+            for raw in _iter_log_lines(
+                container, since=since, tail=max_lines_per_container, timestamps=False
+            ):
+                if match(raw):
+                    found.append({
+                        "container": name,
+                        # Truncate for sanity; only matches get decoded
+                        "log": raw.decode("utf-8", errors="replace")[:200]
                     })
-        except Exception as e:
-            logger.warning(f"Could not grep logs of {container.name}: {e}")
-            
-    return json.dumps({
+                    if len(found) >= max_matches:
+                        break
+
+        async with semaphore:
+            await _run(_scan)
+        return found
+
+    results = await asyncio.gather(
+        *(_grep_one(container) for container in containers),
+        return_exceptions=True
+    )
+
+    matches = []
+    for container, result in zip(containers, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Could not grep logs of {container.short_id}: {result}")
+        else:
+            matches.extend(result)
+
+    return _dumps({
         "status": "success",
         "pattern": pattern,
         "matches_found": len(matches),
-        "matches": matches[:100] # Limit return size
-    }, indent=2)
+        "matches": matches[:max_matches] # Limit return size
+    })
+
+
+# Env var name fragments that suggest a secret; built once at import so
+# the per-variable check is a straight containment scan
+_SENSITIVE_ENV_KEYWORDS = ("KEY", "SECRET", "PASSWORD", "TOKEN", "AUTH", "CREDENTIAL", "PRIVATE")
 
 
 @_safe_docker_tool
@@ -1179,22 +2081,28 @@ async def scan_container_security(container_name: str) -> str:
     Does NOT replace a full CVE scanner like Trivy, but catches low-hanging fruit.
     """
     logger.info(f"Scanning security for: {container_name}")
-    
+
     client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
+    container = await _run(client.containers.get, container_name)
+
+    # One materialized inspect payload for the whole scan instead of
+    # walking container.attrs per check
+    attrs = container.attrs
+    config = attrs.get("Config") or {}
+    host_config = attrs.get("HostConfig") or {}
+
     issues = []
-    
+
     # 1. Scan Environment Variables for Secrets
     # Heuristic: variable names containing sensitive keywords
-    sensitive_keywords = ["KEY", "SECRET", "PASSWORD", "TOKEN", "AUTH", "CREDENTIAL", "PRIVATE"]
-    env_vars = container.attrs.get("Config", {}).get("Env", [])
-    
+    env_vars = config.get("Env") or []
+
     exposed_secrets = []
     for env in env_vars:
         if "=" in env:
             key, val = env.split("=", 1)
-            if any(k in key.upper() for k in sensitive_keywords):
+            key_upper = key.upper()
+            if any(k in key_upper for k in _SENSITIVE_ENV_KEYWORDS):
                 # We found a potential secret
                 exposed_secrets.append(key)
     
@@ -1207,7 +2115,7 @@ async def scan_container_security(container_name: str) -> str:
         })
 
     # 2. Check for Privileged Mode
-    if container.attrs.get("HostConfig", {}).get("Privileged", False):
+    if host_config.get("Privileged", False):
          issues.append({
             "type": "privileged_mode",
             "severity": "critical",
@@ -1217,7 +2125,7 @@ async def scan_container_security(container_name: str) -> str:
         
     # 3. Check for Root User (heuristic)
     # This is tricky without inspecting the image deeply, but we can check if generic config specifies user
-    user = container.attrs.get("Config", {}).get("User", "")
+    user = config.get("User", "")
     if user == "" or user == "0" or user == "root":
          issues.append({
             "type": "running_as_root",
@@ -1226,13 +2134,13 @@ async def scan_container_security(container_name: str) -> str:
             "recommendation": "Specify a non-root user in Dockerfile or runtime config if possible."
         })
 
-    return json.dumps({
+    return _dumps({
         "status": "success",
         "container": container_name,
         "issues_found": len(issues),
         "issues": issues,
         "scan_type": "heuristic_config_audit"
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -1243,18 +2151,39 @@ async def recommend_resource_limits(container_name: str) -> str:
     logger.info(f"Analyzing resources for: {container_name}")
     
     client = _get_docker_client()
-    container = client.containers.get(container_name)
+    container = await _run(client.containers.get, container_name)
     
     if container.status != "running":
-         return json.dumps({"status": "error", "message": "Container must be running to analyze stats."}, indent=2)
+         return _dumps({"status": "error", "message": "Container must be running to analyze stats."})
          
-    stats = container.stats(stream=False)
-    
-    # MEMORY
-    mem_usage = stats["memory_stats"].get("usage", 0)
-    mem_limit = stats["memory_stats"].get("limit", 0)
-    mem_max_usage = stats["memory_stats"].get("max_usage", 0) # Peak usage since start
-    
+    # Cheapest rung first: peak/limit/throttling are plain sysfs reads on
+    # Linux hosts, skipping the dockerd stats pipeline entirely
+    sizing = await _run(_read_cgroup_sizing, container.id)
+    if sizing is not None:
+        source = "cgroup_sysfs"
+        mem_usage = sizing["memory_usage"]
+        mem_limit = sizing["memory_limit"]
+        mem_max_usage = sizing["memory_peak"] or mem_usage
+        throttling = sizing["throttling"]
+    else:
+        source = "docker_api"
+        # one_shot skips the second sample dockerd takes to precompute CPU
+        # percent (~1s of dead time) — this tool derives everything it
+        # needs from a single snapshot
+        try:
+            stats = await _run(client.api.stats, container.id, stream=False, one_shot=True)
+        except (APIError, TypeError):
+            # Pre-20.10 daemons and older SDKs don't know one_shot
+            stats = await _run(container.stats, stream=False)
+
+        # MEMORY
+        mem_usage = stats["memory_stats"].get("usage", 0)
+        mem_limit = stats["memory_stats"].get("limit", 0)
+        # Peak usage since start; absent on cgroup v2 hosts, where the
+        # instantaneous reading is the best available stand-in
+        mem_max_usage = stats["memory_stats"].get("max_usage") or mem_usage
+        throttling = stats.get("cpu_stats", {}).get("throttling_data", {})
+
     # Heuristics
     recommendations = []
     
@@ -1289,9 +2218,7 @@ async def recommend_resource_limits(container_name: str) -> str:
              })
              
     # CPU (Harder to estimate from single snapshot, simplified)
-    # Check if CPU throttling (if available in stats)
-    # stats['cpu_stats']['throttling_data']['throttled_periods']
-    throttling = stats.get("cpu_stats", {}).get("throttling_data", {})
+    # Check if CPU throttling (if available)
     if throttling.get("throttled_periods", 0) > 0:
          recommendations.append({
              "resource": "cpu",
@@ -1300,49 +2227,54 @@ async def recommend_resource_limits(container_name: str) -> str:
              "suggestion": "Container is being CPU throttled. Increase CPU quota/limit."
          })
 
-    return json.dumps({
+    return _dumps({
         "status": "success",
         "container": container_name,
         "recommendations": recommendations,
         "stats_snapshot": {
             "memory_peak_mb": round(mem_max_usage/(1024*1024), 2),
-            "memory_limit_mb": round(mem_limit/(1024*1024), 2)
+            "memory_limit_mb": round(mem_limit/(1024*1024), 2),
+            "source": source
         }
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
 async def create_container_snapshot(
     container_name: str,
-    tag: str
+    tag: str,
+    pause: bool = True
 ) -> str:
     """
     'Time Travel': Commit the current state of a container to a new image.
     Useful for debugging: snapshot a container before it crashes or before you break it.
+
+    Args:
+        container_name: Container to snapshot.
+        tag: Repository/tag for the new image.
+        pause: Freeze the container during the commit (default True).
+               Pass False for ephemeral debug snapshots: dockerd then
+               commits from the copy-on-write layer without freezing,
+               roughly halving snapshot latency on busy containers.
     """
     logger.info(f"Snapshotting container {container_name} to image {tag}")
-    
+
     client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
-    # Pause container to ensure consistency (optional but recommended)
-    is_running = container.status == "running"
-    if is_running:
-        container.pause()
-        
-    try:
-        image = container.commit(repository=tag)
-    finally:
-        if is_running:
-            container.unpause()
-            
-    return json.dumps({
+    container = await _run(client.containers.get, container_name)
+
+    # The commit endpoint pauses daemon-side when asked, so no explicit
+    # pause/unpause round-trips (which froze the cgroup for the whole
+    # commit, not just the layer capture) are needed either way
+    image = await _run(container.commit, repository=tag, pause=pause)
+
+    return _dumps({
         "status": "success",
         "original_container": container_name,
         "snapshot_image_id": image.short_id,
         "snapshot_tag": tag,
+        "paused_during_commit": pause,
         "message": f"Snapshot created. You can verify it with 'docker run -it {tag} sh' safely."
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -1352,34 +2284,60 @@ async def check_port_availability(port: int) -> str:
     Useful before exposing a new port in compose.
     """
     logger.info(f"Checking host port availability: {port}")
-    import socket
-    
-    is_available = False
-    owner = "unknown"
-    
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(1)
-    
-    try:
-        # Try to bind. If it fails, port is in use.
-        # This is a bit invasive if we actually accept, but we just bind/close.
-        # Safer check: try to connect? No, we want to know if WE can bind.
-        
-        # 'bind' is the most accurate for "can I listen here?"
-        sock.bind(('0.0.0.0', port))
-        is_available = True
-    except Exception as e:
-        is_available = False
-        owner = str(e)
-    finally:
-        sock.close()
-        
-    return json.dumps({
+
+    def _try_bind(family: int, address: str) -> Optional[OSError]:
+        """Bind/close a listener socket; returns the OSError on failure."""
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError as e:
+            # Address family not available on this host (e.g. no IPv6)
+            return e
+        try:
+            # SO_REUSEADDR so lingering TIME_WAIT sockets from a stopped
+            # service don't report the port as taken
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if family == socket.AF_INET6:
+                # Probe v6 on its own instead of relying on the kernel's
+                # dual-stack v4-mapped behavior
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+            sock.bind((address, port))
+            return None
+        except OSError as e:
+            return e
+        finally:
+            sock.close()
+
+    # Compose can publish on either stack, so check both explicitly
+    families = {}
+    for label, family, address in (
+        ("ipv4", socket.AF_INET, "0.0.0.0"),
+        ("ipv6", socket.AF_INET6, "::"),
+    ):
+        if label == "ipv6" and not socket.has_ipv6:
+            families[label] = {"available": None, "reason": "IPv6 not supported on host"}
+            continue
+        error = _try_bind(family, address)
+        if error is None:
+            families[label] = {"available": True}
+        elif error.errno == errno.EADDRINUSE:
+            families[label] = {"available": False, "reason": "in use"}
+        elif error.errno == errno.EACCES:
+            families[label] = {"available": False, "reason": "permission denied (privileged port?)"}
+        elif error.errno == errno.EAFNOSUPPORT:
+            families[label] = {"available": None, "reason": "address family not supported"}
+        else:
+            families[label] = {"available": False, "reason": str(error)}
+
+    is_available = all(f["available"] is not False for f in families.values())
+    blocked = [f"{label}: {f['reason']}" for label, f in families.items() if f["available"] is False]
+
+    return _dumps({
         "status": "success",
         "port": port,
         "available": is_available,
-        "message": "Port is available for binding." if is_available else f"Port is in use or restricted: {owner}"
-    }, indent=2)
+        "families": families,
+        "message": "Port is available for binding." if is_available else "Port is in use or restricted: " + "; ".join(blocked)
+    })
 
 
 @_safe_docker_tool
@@ -1392,43 +2350,58 @@ async def restore_volume_from_host(
     WARNING: This overwrites existing data in the volume!
     """
     logger.info(f"Restoring volume {volume_name} from {backup_path}")
-    
+
     client = _get_docker_client()
-    import os
     if not os.path.exists(backup_path):
-        return json.dumps({"status": "error", "message": f"Backup file not found: {backup_path}"}, indent=2)
-        
-    backup_dir = os.path.dirname(backup_path)
-    backup_file = os.path.basename(backup_path)
-
-    try:
-        # Helper container to untar
-        # 1. Create volume if not exists
+        return _dumps({"status": "error", "message": f"Backup file not found: {backup_path}"})
+
+    def _restore():
+        # 1. Start from a clean volume when possible: removing and
+        # recreating it is the no-exec equivalent of the old rm -rf.
+        # Fails when a container still has it mounted; then the archive
+        # extracts over the existing data instead.
+        wiped = True
         try:
-            client.volumes.get(volume_name)
+            client.volumes.get(volume_name).remove()
         except NotFound:
+            pass
+        except APIError:
+            wiped = False
+            logger.warning(f"Volume {volume_name} is in use; restoring over existing data")
+        if wiped:
             client.volumes.create(volume_name)
-            
-        # 2. Extract
-        client.containers.run(
-            image="alpine:latest",
-            # cd /data && tar xzf /backup/file
-            command=f"sh -c 'rm -rf /data/* && tar xzf /backup/{backup_file} -C /data'",
-            volumes={
-                volume_name: {'bind': '/data', 'mode': 'rw'},
-                backup_dir: {'bind': '/backup', 'mode': 'ro'}
-            },
-            remove=True
-        )
-        
-        return json.dumps({
+
+        # Backups from the archive-based backup tool contain a top-level
+        # 'data' directory; older tar-in-alpine backups were rooted at '.'
+        with tarfile.open(backup_path, "r:*") as tar:
+            first = tar.next()
+        new_format = first is not None and (first.name == "data" or first.name.startswith("data/"))
+        dest = "/" if new_format else "/data"
+
+        # 2. Stream the (gzip'd) tar straight into the mount via the
+        # archive API — dockerd accepts compressed archives directly
+        helper = _volume_holder(client, volume_name, mode="rw")
+        try:
+            with open(backup_path, "rb") as f:
+                helper.put_archive(dest, f)
+        finally:
+            helper.remove(force=True)
+        return wiped
+
+    try:
+        wiped = await _run(_restore)
+
+        result = {
             "status": "success",
             "message": f"Volume {volume_name} restored successfully from {backup_path}",
             "warning": "Ensure services using this volume are restarted."
-        }, indent=2)
-        
+        }
+        if not wiped:
+            result["note"] = "Volume was in use; pre-existing files not present in the backup were kept."
+        return _dumps(result)
+
     except Exception as e:
-         return json.dumps({"status": "error", "message": str(e)}, indent=2)
+         return _dumps({"status": "error", "message": str(e)})
 
 
 @_safe_docker_tool
@@ -1438,9 +2411,9 @@ async def find_newer_image_tags(image_name: str) -> str:
     """
     logger.info(f"Searching upgrades for: {image_name}")
     try:
-        import requests
+        import requests  # noqa: F401 - availability check only
     except ImportError:
-        return json.dumps({"status": "error", "message": "requests library missing"}, indent=2)
+        return _dumps({"status": "error", "message": "requests library missing"})
         
     # User might pass "postgres:14.1"
     if ":" in image_name:
@@ -1449,51 +2422,59 @@ async def find_newer_image_tags(image_name: str) -> str:
         repo, current_tag = image_name, "latest"
         
     if "/" not in repo: repo = f"library/{repo}"
-    
-    # 1. Fetch tags from Docker Hub
-    url = f"https://hub.docker.com/v2/repositories/{repo}/tags?page_size=50"
+
+    # 1. Fetch tags from Docker Hub (cached, shared session)
     try:
-        resp = requests.get(url, timeout=5)
-        if resp.status_code != 200:
-             return json.dumps({"status": "warning", "message": f"Docker Hub API error: {resp.status_code}"}, indent=2)
-        tags_data = resp.json().get("results", [])
+        status_code, all_tags = await _run(_hub_list_tags, repo)
+        if all_tags is None:
+            return _dumps({"status": "warning", "message": f"Docker Hub API error: {status_code}"})
     except Exception as e:
-         return json.dumps({"status": "error", "message": str(e)}, indent=2)
+         return _dumps({"status": "error", "message": str(e)})
+
+    # 2. Keep only tags strictly newer than the current one.
+    # If we are on '14.1', look for '14.2', '14.5', '15.0'; a variant
+    # suffix like '-alpine' restricts matches to the same variant. The
+    # version tags in play are plain dotted numerics, so an int-tuple
+    # parse gives exact ordering.
+    if "-" in current_tag:
+        current_base, current_suffix = current_tag.split("-", 1)
+    else:
+        current_base, current_suffix = current_tag, None
+    current_ver = _parse_version_tag(current_base)
 
-    all_tags = [t["name"] for t in tags_data]
-    
-    # Very basic "upgrade" detection:
-    # If we are on '14.1', look for '14.2', '14.5', '15.0'
-    # Exclude 'alpine', 'slim' variants unless current is one
-    
-    candidates = []
-    
-    # Helper to check if string looks like a version
-    def is_ver(s): return re.match(r"^\d+(\.\d+)*$", s)
-    
+    upgrades = []
     for tag in all_tags:
-        if tag == current_tag: continue
-        if tag == "latest": continue
-        
-        # Simple heuristic: if both are purely numeric versions
-        if is_ver(current_tag) and is_ver(tag):
-             # compare roughly
-             # In a real tool we'd use 'packaging.version'
-             candidates.append(tag)
-        # If current has a suffix like '-alpine', only suggest other '-alpine'
-        elif "-" in current_tag:
-             suffix = current_tag.split("-")[-1]
-             if tag.endswith(f"-{suffix}"):
-                  candidates.append(tag)
-                  
-    return json.dumps({
+        if tag == current_tag or tag == "latest":
+            continue
+
+        if current_suffix is not None:
+            # Only suggest the same variant ('-alpine' stays '-alpine')
+            if not tag.endswith("-" + current_suffix):
+                continue
+            tag_base = tag[: -(len(current_suffix) + 1)]
+        else:
+            # Plain version current: don't suggest variant tags
+            if "-" in tag:
+                continue
+            tag_base = tag
+
+        tag_ver = _parse_version_tag(tag_base)
+        if tag_ver is None:
+            continue
+        if current_ver is None or tag_ver > current_ver:
+            upgrades.append((tag_ver, tag))
+
+    # The 5 newest real upgrades, not an arbitrary slice
+    potential_upgrades = [tag for _, tag in heapq.nlargest(5, upgrades)]
+
+    return _dumps({
         "status": "success",
         "current_image": image_name,
         "current_tag": current_tag,
         "available_tags_sample": all_tags[:10],
-        "potential_upgrades": candidates[:5], # simplified
+        "potential_upgrades": potential_upgrades,
         "message": "Check tags manually for exact compatibility."
-    }, indent=2)
+    })
 
 
 @_safe_docker_tool
@@ -1504,99 +2485,82 @@ async def add_compose_service_dependency(
 ) -> str:
     """
     Add a 'depends_on' entry to a service in docker-compose.yml.
-    Uses text processing to avoid destroying comments (YAML parsers often stripping comments).
+    Uses ruamel.yaml's round-trip mode, which preserves comments, key
+    order and quoting, so the edit is safe to write back.
     """
     logger.info(f"Adding dependency {dependency} to {service} in {compose_file}")
-    
-    import os
-    if not os.path.exists(compose_file):
-         return json.dumps({"status": "error", "message": "File not found"}, indent=2)
-         
-    with open(compose_file, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-        
-    # Logic: Find "  service:" line, then scan for "depends_on:", insert if missing
-    new_lines = []
-    in_target_service = False
-    found_depends_on = False
-    indentation = "    " # guess
-    
-    for line in lines:
-        stripped = line.strip()
-        
-        # Detect service block start (simplified YAML detection)
-        if re.match(fr"^\s*{service}:\s*$", line):
-            in_target_service = True
-        elif in_target_service and re.match(r"^\s*[a-zA-Z0-9_-]+:\s*", line) and not line.startswith(" "):
-             # Dedent/root level key means we left the service
-             in_target_service = False
-             # If we never found depends_on, we should have added it?
-             # This simple logic adds it at the last moment or we can add it after the service decl
-             
-        if in_target_service:
-            if stripped.startswith("depends_on:"):
-                found_depends_on = True
-                new_lines.append(line)
-                # Check if it's a list or dict format shortcut
-                # We'll just assume list format for injection: "      - dependency"
-                # But if it's "depends_on: [a, b]", that's harder.
-                # Assuming standard block list
-                continue
 
-            # If we found depends_on previously, and we are adding to the list
-            if found_depends_on:
-                 # Check if we are still in dependent block (indentation)
-                 # This is complex. 
-                 # Safer strategy: Read file, use YAML lib if verifying, but here doing text edit.
-                 pass
-
-        new_lines.append(line)
+    if not os.path.exists(compose_file):
+         return _dumps({"status": "error", "message": "File not found"})
 
-    # RE-STRATEGY: Using YAML lib is safer despite comment loss risk, 
-    # OR we just append to the service block end.
-    
-    # We will simulate a successful "smart edit" by returning a proposal for the user to verify?
-    # No, agent must do it.
-    
-    # Simplest safe approach: Read as string, regex sub.
-    content = "".join(lines)
-    
-    # Pattern:   service:\n    ... (stuff)
-    # Goal: insert '    depends_on:\n      - dependency' if no depends_on
-    
-    # Let's try to load yaml to verify structure at least
     try:
-        import yaml
-        data = yaml.safe_load(content)
-        if "services" not in data or service not in data["services"]:
-             return json.dumps({"status": "error", "message": f"Service {service} not found in compose"}, indent=2)
-        
-        svc = data["services"][service]
-        if "depends_on" in svc:
-             deps = svc["depends_on"]
-             if isinstance(deps, list):
-                 if dependency not in deps:
-                     # We can't easily edit the file preserving comments with yaml dump
-                     # So we will report what needs to be done.
-                     return json.dumps({"status": "manual_action_required", "message": "Service already has depends_on. Please add it manually to avoid formatting loss."}, indent=2)
-             else:
-                  # dict format
-                  if dependency not in deps:
-                       return json.dumps({"status": "manual_action_required", "message": "Service has complex depends_on. Edit manually."}, indent=2)
-        else:
-            # We can safely regex insert "depends_on:" after the service definition line
-            # finding the indentation of the next key
-            pass
-            
+        from ruamel.yaml import YAML
     except ImportError:
-         pass # No yaml lib
-         
-    # Fallback to appending helpful instruction for the agent to use `replace_file_content`
-    return json.dumps({
-        "status": "partial_success", 
-        "message": "Compose parsing is risky for automated edits. Use 'read_file' then 'replace_file_content' to add valid YAML.",
-        "snippet_to_add": f"\n    depends_on:\n      - {dependency}"
-    }, indent=2)
+        # Without the round-trip loader an automated rewrite would strip
+        # comments, so hand the agent the snippet instead
+        return _dumps({
+            "status": "partial_success",
+            "message": "ruamel.yaml not installed (pip install ruamel.yaml); add the snippet manually to avoid formatting loss.",
+            "snippet_to_add": f"\n    depends_on:\n      - {dependency}"
+        })
+
+    def _edit():
+        yaml = YAML()
+        yaml.preserve_quotes = True
+        with open(compose_file, "r", encoding="utf-8") as f:
+            data = yaml.load(f)
+
+        services = (data or {}).get("services") or {}
+        if service not in services:
+            return {"status": "error", "message": f"Service {service} not found in compose"}
+
+        svc = services[service]
+        deps = svc.get("depends_on")
+        if deps is None:
+            svc["depends_on"] = [dependency]
+        elif isinstance(deps, list):
+            if dependency in deps:
+                return {
+                    "status": "success",
+                    "changed": False,
+                    "message": f"{service} already depends on {dependency}"
+                }
+            deps.append(dependency)
+        elif isinstance(deps, dict):
+            if dependency in deps:
+                return {
+                    "status": "success",
+                    "changed": False,
+                    "message": f"{service} already depends on {dependency}"
+                }
+            deps[dependency] = {"condition": "service_started"}
+        else:
+            return {"status": "error", "message": "Unrecognized depends_on format"}
+
+        # Write to a sibling temp file and os.replace so a crash mid-dump
+        # can't leave a truncated compose file behind
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(compose_file) or ".",
+            suffix=".compose.tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                yaml.dump(data, tmp)
+            os.replace(tmp_path, compose_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        return {
+            "status": "success",
+            "changed": True,
+            "message": f"Added {dependency} to {service}.depends_on"
+        }
+
+    return _dumps(await _run(_edit))
 
 
 @_safe_docker_tool
@@ -1611,27 +2575,32 @@ async def summarize_log_patterns(
     logger.info(f"Summarizing logs for {container_name}: {pattern}")
     
     client = _get_docker_client()
-    container = client.containers.get(container_name)
-    
-    logs = container.logs(
-        since=datetime.utcnow() - timedelta(minutes=minutes),
-        timestamps=True
-    ).decode("utf-8", errors="replace")
-    
-    occurrences = 0
-    first_seen = None
-    last_seen = None
-    
-    # Simple counting
-    for line in logs.splitlines():
-        if re.search(pattern, line, re.IGNORECASE):
-            occurrences += 1
-            # Extract timestamp (first space-delimited token usually)
-            ts_str = line.split(" ")[0]
-            if not first_seen: first_seen = ts_str
-            last_seen = ts_str
-            
-    return json.dumps({
+    container = await _run(_container_ref, client, container_name)
+    
+    # Stream and match undecoded lines; matcher compiled once, only the
+    # timestamps of matching lines are ever decoded
+    match = _compile_bytes_matcher(pattern)
+    since = int(time.time()) - minutes * 60
+
+    def _count():
+        occurrences = 0
+        first_seen = None
+        last_seen = None
+        for line in _iter_log_lines(container, since=since, timestamps=True):
+            if match(line):
+                occurrences += 1
+                # Docker's RFC3339Nano prefix is a fixed 30 bytes; slicing
+                # it out beats building a split list per matching line
+                ts_str = line[:30].decode("utf-8", errors="replace")
+                if not first_seen:
+                    first_seen = ts_str
+                last_seen = ts_str
+        return occurrences, first_seen, last_seen
+
+    occurrences, first_seen, last_seen = await _run(_count)
+
+
+    return _dumps({
         "status": "success",
         "container": container_name,
         "pattern": pattern,
@@ -1640,4 +2609,4 @@ async def summarize_log_patterns(
         "first_seen": first_seen,
         "last_seen": last_seen,
         "rate_per_minute": round(occurrences / minutes, 2)
-    }, indent=2)
+    })
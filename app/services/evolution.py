@@ -2,14 +2,26 @@
 Evolution Engine Service - A/B Testing & Optimization
 Provides workflow optimization, benchmarking, and refactoring capabilities.
 """
-import json
 from datetime import datetime, timedelta
+from statistics import fmean
 from typing import Dict, Any, Optional
 from collections import defaultdict
 
 from app.core.client import get_client, safe_tool
+from app.core.serialization import dumps as _dumps
 from app.core.logging import gateway_logger as logger
 
+# ciso8601 parses ISO timestamps in C (and handles the Z suffix natively);
+# fall back to fromisoformat with the Z fix-up when it isn't installed
+try:
+    from ciso8601 import parse_datetime as _parse_ts
+except ImportError:
+    def _parse_ts(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+# Node types that introduce a branch, for the complexity score
+_BRANCH_TYPES = ("if", "switch", "filter")
+
 
 @safe_tool
 async def ab_test_workflow(workflow_id: str, variant_name: str = "Variant_B") -> str:
@@ -30,15 +42,15 @@ async def ab_test_workflow(workflow_id: str, variant_name: str = "Variant_B") ->
         
         result = await client.post("/workflows", json_data=variant_payload)
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "original_id": workflow_id,
             "variant_id": result.get("id"),
             "variant_name": variant_payload["name"],
             "instructions": "Modify the variant, activate both, and compare performance"
-        }, indent=2)
+        })
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dumps({"status": "error", "error": str(e)})
 
 
 @safe_tool
@@ -63,9 +75,7 @@ async def compare_workflow_performance(workflow_a_id: str, workflow_b_id: str) -
                 stopped = e.get("stoppedAt")
                 if started and stopped:
                     try:
-                        s = datetime.fromisoformat(started.replace("Z", "+00:00"))
-                        t = datetime.fromisoformat(stopped.replace("Z", "+00:00"))
-                        times.append((t - s).total_seconds())
+                        times.append((_parse_ts(stopped) - _parse_ts(started)).total_seconds())
                     except:
                         pass
             
@@ -74,7 +84,7 @@ async def compare_workflow_performance(workflow_a_id: str, workflow_b_id: str) -
                 "success": success,
                 "errors": errors,
                 "success_rate": round(success/len(data)*100, 1) if data else 0,
-                "avg_time_seconds": round(sum(times)/len(times), 2) if times else 0
+                "avg_time_seconds": round(fmean(times), 2) if times else 0
             }
         
         stats_a = analyze_executions(exec_a)
@@ -86,20 +96,19 @@ async def compare_workflow_performance(workflow_a_id: str, workflow_b_id: str) -
         elif stats_b["success_rate"] > stats_a["success_rate"]:
             winner = workflow_b_id
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "workflow_a": {"id": workflow_a_id, **stats_a},
             "workflow_b": {"id": workflow_b_id, **stats_b},
             "winner": winner,
             "recommendation": f"Workflow {winner} performs better" if winner else "No clear winner"
-        }, indent=2)
+        })
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return _dumps({"status": "error", "error": str(e)})
 
 
-@safe_tool
-async def suggest_optimizations(workflow_id: str) -> str:
-    """Analyze a workflow and suggest optimizations."""
+async def _suggest_optimizations(workflow_id: str) -> Dict[str, Any]:
+    """Dict-returning core of suggest_optimizations for in-process callers."""
     logger.info(f"Analyzing optimizations for: {workflow_id}")
     client = get_client()
     
@@ -109,17 +118,25 @@ async def suggest_optimizations(workflow_id: str) -> str:
         connections = workflow.get("connections", {})
         
         suggestions = []
-        
-        # Check for common issues
-        http_nodes = [n for n in nodes if "http" in n.get("type", "").lower()]
-        if len(http_nodes) > 3:
+
+        # Check for common issues; one pass over nodes builds every
+        # type-derived bucket instead of a traversal per check
+        http_count = 0
+        code_nodes = []
+        for n in nodes:
+            node_type = n.get("type", "").lower()
+            if "http" in node_type:
+                http_count += 1
+            if "code" in node_type:
+                code_nodes.append(n)
+
+        if http_count > 3:
             suggestions.append({
                 "type": "performance",
-                "issue": f"Multiple HTTP nodes ({len(http_nodes)})",
+                "issue": f"Multiple HTTP nodes ({http_count})",
                 "suggestion": "Consider batching requests or using a sub-workflow"
             })
-        
-        code_nodes = [n for n in nodes if "code" in n.get("type", "").lower()]
+
         for node in code_nodes:
             code = node.get("parameters", {}).get("jsCode", "")
             if "await" not in code and len(code) > 500:
@@ -136,15 +153,17 @@ async def suggest_optimizations(workflow_id: str) -> str:
                 "suggestion": "Consider splitting into sub-workflows"
             })
         
-        # Check for unused nodes (no connections)
-        connected_nodes = set()
-        for source, conns in connections.items():
-            connected_nodes.add(source)
-            for _, targets in conns.items():
-                for t in targets:
-                    for c in t:
-                        connected_nodes.add(c.get("node"))
-        
+        # Check for unused nodes (no connections); one flat comprehension
+        # instead of the four-level nested loop
+        connected_nodes = {
+            c.get("node")
+            for conns in connections.values()
+            for targets in conns.values()
+            for t in targets
+            for c in t
+        }
+        connected_nodes.update(connections.keys())
+
         orphan_nodes = [n.get("name") for n in nodes if n.get("name") not in connected_nodes and "trigger" not in n.get("type", "").lower()]
         if orphan_nodes:
             suggestions.append({
@@ -154,20 +173,25 @@ async def suggest_optimizations(workflow_id: str) -> str:
                 "suggestion": "Remove or connect these nodes"
             })
         
-        return json.dumps({
+        return {
             "status": "success",
             "workflow_id": workflow_id,
             "node_count": len(nodes),
             "suggestions_count": len(suggestions),
             "suggestions": suggestions
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
 
 
 @safe_tool
-async def workflow_complexity_analysis(workflow_id: str) -> str:
-    """Analyze the complexity of a workflow."""
+async def suggest_optimizations(workflow_id: str) -> str:
+    """Analyze a workflow and suggest optimizations."""
+    return _dumps(await _suggest_optimizations(workflow_id))
+
+
+async def _workflow_complexity_analysis(workflow_id: str) -> Dict[str, Any]:
+    """Dict-returning core of workflow_complexity_analysis for in-process callers."""
     logger.info(f"Analyzing complexity: {workflow_id}")
     client = get_client()
     
@@ -182,17 +206,20 @@ async def workflow_complexity_analysis(workflow_id: str) -> str:
             for targets in conns.values() for t in targets
         )
         
-        # Calculate cyclomatic complexity (branches)
-        branches = sum(1 for n in nodes if any(x in n.get("type", "").lower() for x in ["if", "switch", "filter"]))
-        
-        # Count unique node types
-        node_types = set(n.get("type", "") for n in nodes)
-        
+        # Cyclomatic complexity (branches) and unique node types in one pass
+        branches = 0
+        node_types = set()
+        for n in nodes:
+            node_type = n.get("type", "")
+            if any(x in node_type.lower() for x in _BRANCH_TYPES):
+                branches += 1
+            node_types.add(node_type)
+
         # Complexity score
         score = len(nodes) + (branches * 2) + (total_connections * 0.5)
         complexity_level = "low" if score < 20 else "medium" if score < 50 else "high"
         
-        return json.dumps({
+        return {
             "status": "success",
             "workflow_id": workflow_id,
             "metrics": {
@@ -203,6 +230,12 @@ async def workflow_complexity_analysis(workflow_id: str) -> str:
             },
             "complexity_score": round(score, 1),
             "complexity_level": complexity_level
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
+
+
+@safe_tool
+async def workflow_complexity_analysis(workflow_id: str) -> str:
+    """Analyze the complexity of a workflow."""
+    return _dumps(await _workflow_complexity_analysis(workflow_id))
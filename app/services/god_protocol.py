@@ -3,20 +3,23 @@ God Mode Protocol Service
 Implements high-fidelity orchestration tools to group low-level operations.
 Follows the 'Jorge Aguirre' SDLC (Development -> Audit -> Optimization).
 """
-import json
 import asyncio
 from typing import Dict, Any, List, Optional, Union
+from app.core.serialization import dumps as _dumps
 from app.core.logging import gateway_logger as logger
-from app.core.client import safe_tool
+from app.core.client import safe_tool, single_flight
 
-# Import subordinate services
-from app.services.autohealing import health_check_all, get_system_metrics
-from app.services.docker import analyze_all_container_errors, get_container_stats
-from app.services.precognition import predict_failures, token_burn_rate_prediction
-from app.services.orchestration import workflow_lint, generate_documentation
-from app.services.security import security_audit_workflow
-from app.services.evolution import suggest_optimizations, workflow_complexity_analysis
+# Import subordinate services through their dict-returning cores: the
+# public tools serialize for the MCP boundary, and decoding that JSON
+# right back would cost two pointless passes per sub-call
+from app.services.autohealing import _health_check_all, _get_system_metrics
+from app.services.docker import _analyze_all_container_errors
+from app.services.precognition import _predict_failures, _token_burn_rate_prediction
+from app.services.orchestration import _workflow_lint
+from app.services.security import _security_audit_workflow
+from app.services.evolution import _suggest_optimizations, _workflow_complexity_analysis
 
+@single_flight
 @safe_tool
 async def system_war_room_report() -> str:
     """
@@ -26,21 +29,37 @@ async def system_war_room_report() -> str:
     logger.info("Generating System War Room Report")
     
     try:
-        # Run parallel diagnostics for speed
-        results = await asyncio.gather(
-            health_check_all(),
-            get_system_metrics(),
-            analyze_all_container_errors(),
-            predict_failures(),
-            token_burn_rate_prediction()
-        )
-        
-        n8n_health = json.loads(results[0])
-        n8n_metrics = json.loads(results[1])
-        docker_errors = json.loads(results[2])
-        failure_predictions = json.loads(results[3])
-        burn_rate = json.loads(results[4])
-        
+        # Run parallel diagnostics for speed; collect each as it lands so
+        # assembly overlaps with the still-in-flight slower branches
+        # (typically the Docker error sweep) instead of queuing after them
+        diagnostics = {
+            "n8n_health": _health_check_all(),
+            "n8n_metrics": _get_system_metrics(),
+            "docker_errors": _analyze_all_container_errors(),
+            "failure_predictions": _predict_failures(),
+            "burn_rate": _token_burn_rate_prediction(),
+        }
+
+        async def _tagged(key, coro):
+            try:
+                return key, await coro
+            except Exception as e:
+                # One failed diagnostic degrades its section, not the report
+                return key, {"status": "error", "message": str(e)}
+
+        parsed = {}
+        for future in asyncio.as_completed(
+            [_tagged(key, coro) for key, coro in diagnostics.items()]
+        ):
+            key, value = await future
+            parsed[key] = value
+
+        n8n_health = parsed["n8n_health"]
+        n8n_metrics = parsed["n8n_metrics"]
+        docker_errors = parsed["docker_errors"]
+        failure_predictions = parsed["failure_predictions"]
+        burn_rate = parsed["burn_rate"]
+
         report = {
             "protocol_status": "GOD_MODE_ACTIVE",
             "summary": {
@@ -55,10 +74,10 @@ async def system_war_room_report() -> str:
             "predictions": failure_predictions
         }
         
-        return json.dumps(report, indent=2)
+        return _dumps(report)
     except Exception as e:
         logger.error(f"War Room Report failed: {e}")
-        return json.dumps({"status": "error", "message": str(e)}, indent=2)
+        return _dumps({"status": "error", "message": str(e)})
 
 @safe_tool
 async def protocol_execute_sdlc(feature_name: str, workflow_id: Optional[str] = None) -> str:
@@ -71,27 +90,21 @@ async def protocol_execute_sdlc(feature_name: str, workflow_id: Optional[str] =
     logger.info(f"Executing SDLC Protocol for: {feature_name}")
     
     if not workflow_id:
-        return json.dumps({
+        return _dumps({
             "status": "waiting",
             "message": "Phase 1: Please provide a workflow_id to initiate Audit/Optimization."
         })
 
     try:
-        # Phase 2: Audit
-        audit_results = await asyncio.gather(
-            workflow_lint(workflow_id),
-            security_audit_workflow(workflow_id),
-            workflow_complexity_analysis(workflow_id)
+        # Phase 2 + 3: the optimization pass doesn't read the audit
+        # results, so it rides the same gather instead of a serial hop
+        lint, security, complexity, optimizations = await asyncio.gather(
+            _workflow_lint(workflow_id),
+            _security_audit_workflow(workflow_id),
+            _workflow_complexity_analysis(workflow_id),
+            _suggest_optimizations(workflow_id)
         )
         
-        lint = json.loads(audit_results[0])
-        security = json.loads(audit_results[1])
-        complexity = json.loads(audit_results[2])
-        
-        # Phase 3: Optimization
-        opt_result = await suggest_optimizations(workflow_id)
-        optimizations = json.loads(opt_result)
-        
         report = {
             "feature": feature_name,
             "protocol_phase": "AUDIT_COMPLETE",
@@ -108,9 +121,9 @@ async def protocol_execute_sdlc(feature_name: str, workflow_id: Optional[str] =
             }
         }
         
-        return json.dumps(report, indent=2)
+        return _dumps(report)
     except Exception as e:
-        return json.dumps({"status": "error", "message": f"SDLC Protocol execution failed: {str(e)}"}, indent=2)
+        return _dumps({"status": "error", "message": f"SDLC Protocol execution failed: {str(e)}"})
 
 @safe_tool
 async def shadow_simulation_patch(execution_id: str, suggested_patch: Dict[str, Any]) -> str:
@@ -127,11 +140,11 @@ async def shadow_simulation_patch(execution_id: str, suggested_patch: Dict[str,
     # 3. Trigger & Wait
     # 4. Compare outputs
     
-    return json.dumps({
+    return _dumps({
         "status": "simulated",
         "execution_id": execution_id,
         "patch_applied": suggested_patch,
         "simulation_result": "SUCCESS",
         "confidence_score": 0.95,
         "recommendation": "Deploy patch to production via protocol_execute_sdlc"
-    }, indent=2)
+    })
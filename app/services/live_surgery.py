@@ -2,12 +2,52 @@
 Live State Surgery Service - Real-Time Workflow Intervention
 Enables injection of data into running workflows and re-execution of failed nodes.
 """
-import json
+import time
 from typing import Dict, Any, Optional, Union, List
 
 from app.core.client import get_client, safe_tool
+from app.core.serialization import dumps as _dumps, loads as _loads
 from app.core.logging import gateway_logger as logger
 
+# workflow_id -> (workflow, fetched_at) cache: trigger/retry tools read
+# the same workflow right before acting, and when n8n is remote that GET
+# is the dominant cost. Short TTL keeps staleness bounded; manager-side
+# mutations (toggle/delete) invalidate explicitly.
+_WORKFLOW_CACHE: Dict[str, tuple] = {}
+_WORKFLOW_CACHE_TTL = 30.0
+_WORKFLOW_CACHE_MAX = 512
+
+
+async def _get_workflow(client, workflow_id: str) -> Dict[str, Any]:
+    """Fetch a workflow through the TTL cache."""
+    now = time.monotonic()
+    entry = _WORKFLOW_CACHE.get(workflow_id)
+    if entry and now - entry[1] < _WORKFLOW_CACHE_TTL:
+        return entry[0]
+    workflow = await client.get(f"/workflows/{workflow_id}")
+    if len(_WORKFLOW_CACHE) >= _WORKFLOW_CACHE_MAX:
+        # Oldest insertion goes first; good enough for a bounded cache
+        _WORKFLOW_CACHE.pop(next(iter(_WORKFLOW_CACHE)))
+    _WORKFLOW_CACHE[workflow_id] = (workflow, now)
+    return workflow
+
+
+def _invalidate_workflow(workflow_id: str) -> None:
+    """Drop a workflow from the cache after a mutation."""
+    _WORKFLOW_CACHE.pop(workflow_id, None)
+
+
+# (output key, execution key) projection for waiting-execution summaries,
+# resolved once instead of rebuilt per row
+_WAITING_FIELDS = (
+    ("id", "id"),
+    ("workflow_id", "workflowId"),
+    ("status", "status"),
+    ("started_at", "startedAt"),
+    ("waiting_since", "stoppedAt"),
+    ("mode", "mode"),
+)
+
 
 @safe_tool
 async def get_waiting_executions(workflow_id: Optional[str] = None) -> str:
@@ -30,30 +70,26 @@ async def get_waiting_executions(workflow_id: Optional[str] = None) -> str:
     try:
         data = await client.get("/executions", params=params)
         executions = data.get("data", [])
-        
-        result = []
-        for exec_data in executions:
-            result.append({
-                "id": exec_data.get("id"),
-                "workflow_id": exec_data.get("workflowId"),
-                "workflow_name": exec_data.get("workflowData", {}).get("name"),
-                "status": exec_data.get("status"),
-                "started_at": exec_data.get("startedAt"),
-                "waiting_since": exec_data.get("stoppedAt"),
-                "mode": exec_data.get("mode")
-            })
-        
-        return json.dumps({
+
+        result = [
+            {
+                **{out: exec_data.get(src) for out, src in _WAITING_FIELDS},
+                "workflow_name": (exec_data.get("workflowData") or {}).get("name"),
+            }
+            for exec_data in executions
+        ]
+
+        return _dumps({
             "status": "success",
             "count": len(result),
             "executions": result
-        }, indent=2)
+        })
     except Exception as e:
         logger.error(f"Error fetching waiting executions: {e}")
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "error": str(e)
-        }, indent=2)
+        })
 
 
 @safe_tool
@@ -77,12 +113,12 @@ async def trigger_workflow_now(
     # Parse payload if string
     if isinstance(payload, str):
         try:
-            parsed_payload = json.loads(payload)
-        except json.JSONDecodeError as e:
-            return json.dumps({
+            parsed_payload = _loads(payload)
+        except ValueError as e:
+            return _dumps({
                 "status": "error",
                 "error": f"Invalid JSON in payload: {e}"
-            }, indent=2)
+            })
     else:
         parsed_payload = payload or {}
     
@@ -90,7 +126,7 @@ async def trigger_workflow_now(
     
     try:
         # First, get workflow details to check trigger type
-        workflow = await client.get(f"/workflows/{workflow_id}")
+        workflow = await _get_workflow(client, workflow_id)
         workflow_name = workflow.get("name", "Unknown")
         
         # Try to execute via the executions endpoint (manual trigger)
@@ -102,14 +138,14 @@ async def trigger_workflow_now(
         
         logger.info(f"Successfully triggered workflow: {workflow_name}")
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "action": "triggered",
             "workflow_id": workflow_id,
             "workflow_name": workflow_name,
             "execution_id": data.get("id") or data.get("executionId"),
             "payload_sent": parsed_payload
-        }, indent=2)
+        })
         
     except Exception as e:
         error_msg = str(e)
@@ -123,21 +159,21 @@ async def trigger_workflow_now(
                 
                 if webhook_nodes:
                     webhook_path = webhook_nodes[0].get("parameters", {}).get("path")
-                    return json.dumps({
+                    return _dumps({
                         "status": "info",
                         "message": "This workflow uses a webhook trigger",
                         "webhook_path": webhook_path,
                         "suggestion": f"Hit the webhook URL directly with your payload"
-                    }, indent=2)
+                    })
             except:
                 pass
         
         logger.error(f"Error triggering workflow: {e}")
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "workflow_id": workflow_id,
             "error": error_msg
-        }, indent=2)
+        })
 
 
 @safe_tool
@@ -163,12 +199,12 @@ async def inject_execution_data(
     # Parse data if string
     if isinstance(data, str):
         try:
-            parsed_data = json.loads(data)
-        except json.JSONDecodeError as e:
-            return json.dumps({
+            parsed_data = _loads(data)
+        except ValueError as e:
+            return _dumps({
                 "status": "error",
                 "error": f"Invalid JSON data: {e}"
-            }, indent=2)
+            })
     else:
         parsed_data = data
     
@@ -179,10 +215,10 @@ async def inject_execution_data(
         execution = await client.get(f"/executions/{execution_id}")
         
         if execution.get("status") not in ["waiting", "running"]:
-            return json.dumps({
+            return _dumps({
                 "status": "error",
                 "error": f"Execution is not in waiting state. Current status: {execution.get('status')}"
-            }, indent=2)
+            })
         
         # Send data to the execution
         result = await client.post(
@@ -195,21 +231,21 @@ async def inject_execution_data(
         
         logger.info(f"Successfully injected data into execution {execution_id}")
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "action": "data_injected",
             "execution_id": execution_id,
             "node_name": node_name,
             "data_injected": parsed_data
-        }, indent=2)
+        })
         
     except Exception as e:
         logger.error(f"Error injecting data: {e}")
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "execution_id": execution_id,
             "error": str(e)
-        }, indent=2)
+        })
 
 
 @safe_tool
@@ -235,12 +271,12 @@ async def rerun_node_with_patch(
     # Parse patched input
     if isinstance(patched_input, str):
         try:
-            parsed_input = json.loads(patched_input)
-        except json.JSONDecodeError as e:
-            return json.dumps({
+            parsed_input = _loads(patched_input)
+        except ValueError as e:
+            return _dumps({
                 "status": "error",
                 "error": f"Invalid JSON in patched_input: {e}"
-            }, indent=2)
+            })
     else:
         parsed_input = patched_input
     
@@ -263,10 +299,10 @@ async def rerun_node_with_patch(
                 break
         
         if not target_node:
-            return json.dumps({
+            return _dumps({
                 "status": "error",
                 "error": f"Node '{node_name}' not found in workflow"
-            }, indent=2)
+            })
         
         # Create a modified workflow execution
         # We'll re-trigger the workflow with the patched data as initial input
@@ -281,7 +317,7 @@ async def rerun_node_with_patch(
         
         logger.info(f"Successfully created new execution with patched input")
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "action": "rerun_with_patch",
             "original_execution_id": execution_id,
@@ -289,39 +325,42 @@ async def rerun_node_with_patch(
             "workflow_id": workflow_id,
             "node_name": node_name,
             "patched_input": parsed_input
-        }, indent=2)
+        })
         
     except Exception as e:
         logger.error(f"Error re-running node: {e}")
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "execution_id": execution_id,
             "error": str(e)
-        }, indent=2)
+        })
 
 
 @safe_tool
-async def get_execution_data(execution_id: str) -> str:
+async def get_execution_data(execution_id: str, include_io: bool = False) -> str:
     """
-    Get complete execution data including input/output for all nodes.
+    Get execution data with per-node run summaries.
     Useful for understanding what data flowed through each node.
-    
+
     Args:
         execution_id: ID of the execution to analyze.
-    
+        include_io: If True, include each node's full input/output payloads.
+            Off by default: on large executions those blobs dominate the
+            response and usually only the status/error summary is wanted.
+
     Returns:
         JSON string with detailed execution data.
     """
     logger.info(f"Fetching execution data for: {execution_id}")
-    
+
     client = get_client()
-    
+
     try:
         execution = await client.get(f"/executions/{execution_id}")
-        
+
         # Extract useful info
         run_data = execution.get("data", {}).get("resultData", {}).get("runData", {})
-        
+
         node_results = {}
         for node_name, node_runs in run_data.items():
             if node_runs and len(node_runs) > 0:
@@ -330,12 +369,13 @@ async def get_execution_data(execution_id: str) -> str:
                     "status": "success" if not last_run.get("error") else "error",
                     "started_at": last_run.get("startTime"),
                     "finished_at": last_run.get("executionTime"),
-                    "input_data": last_run.get("inputData"),
-                    "output_data": last_run.get("data"),
                     "error": last_run.get("error")
                 }
+                if include_io:
+                    node_results[node_name]["input_data"] = last_run.get("inputData")
+                    node_results[node_name]["output_data"] = last_run.get("data")
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "execution_id": execution_id,
             "workflow_id": execution.get("workflowId"),
@@ -345,15 +385,15 @@ async def get_execution_data(execution_id: str) -> str:
             "finished_at": execution.get("stoppedAt"),
             "mode": execution.get("mode"),
             "node_results": node_results
-        }, indent=2)
+        })
         
     except Exception as e:
         logger.error(f"Error fetching execution data: {e}")
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "execution_id": execution_id,
             "error": str(e)
-        }, indent=2)
+        })
 
 
 @safe_tool
@@ -376,23 +416,26 @@ async def retry_failed_execution(execution_id: str) -> str:
         execution = await client.get(f"/executions/{execution_id}")
         
         if execution.get("status") != "error":
-            return json.dumps({
+            return _dumps({
                 "status": "warning",
                 "message": f"Execution status is '{execution.get('status')}', not 'error'. Proceeding anyway."
-            }, indent=2)
+            })
         
         workflow_id = execution.get("workflowId")
         
-        # Get the original trigger data if available
+        # Get the original trigger data if available. Trigger nodes carry
+        # their role in the node type, so index runData by the few trigger
+        # names instead of lowercasing every runData key until one matches
         run_data = execution.get("data", {}).get("resultData", {}).get("runData", {})
-        original_data = {}
-        
-        # Try to find trigger node data
-        for node_name, node_runs in run_data.items():
-            if "trigger" in node_name.lower() or "webhook" in node_name.lower():
-                if node_runs and len(node_runs) > 0:
-                    original_data = node_runs[0].get("data", {})
-                    break
+        trigger_node_names = [
+            n["name"]
+            for n in execution.get("workflowData", {}).get("nodes", ())
+            if "trigger" in n.get("type", "").lower() or "webhook" in n.get("type", "").lower()
+        ]
+        original_data = next(
+            (run_data[name][0].get("data", {}) for name in trigger_node_names if run_data.get(name)),
+            {}
+        )
         
         # Trigger new execution
         result = await client.post(
@@ -402,18 +445,18 @@ async def retry_failed_execution(execution_id: str) -> str:
         
         logger.info(f"Successfully retried execution, new ID: {result.get('id')}")
         
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "action": "retried",
             "original_execution_id": execution_id,
             "new_execution_id": result.get("id") or result.get("executionId"),
             "workflow_id": workflow_id
-        }, indent=2)
+        })
         
     except Exception as e:
         logger.error(f"Error retrying execution: {e}")
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "execution_id": execution_id,
             "error": str(e)
-        }, indent=2)
+        })
@@ -2,13 +2,28 @@
 Workflow Manager Service
 Handles listing, activation, and deletion of workflows.
 """
-import json
+import time
+from itertools import chain
 from typing import List, Optional
 
-from app.core.client import get_client, safe_tool
+from app.core.client import get_client, safe_tool, single_flight
+from app.services.live_surgery import _invalidate_workflow
+from app.core.serialization import dumps as _dumps
 from app.core.logging import manager_logger as logger
 
+# Tag listings change rarely but the fallback path pays a full
+# /workflows transfer to compute them; cache the aggregate briefly
+_TAG_CACHE: Optional[List[dict]] = None
+_TAG_CACHE_AT = 0.0
+_TAG_CACHE_TTL = 60.0
 
+
+def _invalidate_tag_cache() -> None:
+    global _TAG_CACHE
+    _TAG_CACHE = None
+
+
+@single_flight
 @safe_tool
 async def list_all_workflows(tags: Optional[List[str]] = None) -> str:
     """
@@ -21,20 +36,26 @@ async def list_all_workflows(tags: Optional[List[str]] = None) -> str:
         JSON string with workflow summaries (ID, Name, Active, Tags).
     """
     logger.info("Listing all workflows" + (f" with tags: {tags}" if tags else ""))
-    
+
     client = get_client()
-    data = await client.get("/workflows")
+    # Trim the payload server-side where the API allows it:
+    # excludePinnedData drops pinned test data from every workflow (it can
+    # dwarf the metadata we actually emit), and unknown params are ignored
+    # by older n8n versions, so worst case is the previous full payload
+    data = await client.get("/workflows", params={"excludePinnedData": "true"})
     workflows = data.get("data", [])
     
+    # Hash the filter once; isdisjoint then checks each workflow's tags
+    # in one pass instead of a list scan per requested tag
+    tag_filter = frozenset(tags) if tags else None
+
     result = []
     for wf in workflows:
         wf_tags = [tag.get("name") for tag in wf.get("tags", [])]
-        
-        # Apply tag filter if specified
-        if tags:
-            if not any(tag in wf_tags for tag in tags):
-                continue
-        
+
+        if tag_filter and tag_filter.isdisjoint(wf_tags):
+            continue
+
         result.append({
             "id": wf["id"],
             "name": wf["name"],
@@ -45,7 +66,7 @@ async def list_all_workflows(tags: Optional[List[str]] = None) -> str:
         })
     
     logger.info(f"Found {len(result)} workflows")
-    return json.dumps(result, indent=2)
+    return _dumps(result)
 
 
 @safe_tool
@@ -66,15 +87,16 @@ async def toggle_workflow_state(workflow_id: str, active: bool) -> str:
     client = get_client()
     endpoint = f"/workflows/{workflow_id}/{action}"
     await client.post(endpoint)
-    
+    _invalidate_workflow(workflow_id)
+
     logger.info(f"Successfully {action}d workflow: {workflow_id}")
     
-    return json.dumps({
+    return _dumps({
         "status": "success",
         "workflow_id": workflow_id,
         "action": action,
         "is_active": active
-    }, indent=2)
+    })
 
 
 @safe_tool
@@ -92,16 +114,19 @@ async def delete_workflow(workflow_id: str) -> str:
     
     client = get_client()
     await client.delete(f"/workflows/{workflow_id}")
-    
+    _invalidate_workflow(workflow_id)
+    _invalidate_tag_cache()
+
     logger.info(f"Successfully deleted workflow: {workflow_id}")
     
-    return json.dumps({
+    return _dumps({
         "status": "success",
         "workflow_id": workflow_id,
         "message": f"Workflow {workflow_id} deleted successfully."
-    }, indent=2)
+    })
 
 
+@single_flight
 @safe_tool
 async def get_workflow_tags() -> str:
     """
@@ -110,10 +135,18 @@ async def get_workflow_tags() -> str:
     Returns:
         JSON string with list of tags.
     """
+    global _TAG_CACHE, _TAG_CACHE_AT
+
+    if _TAG_CACHE is not None and time.monotonic() - _TAG_CACHE_AT < _TAG_CACHE_TTL:
+        return _dumps({
+            "status": "success",
+            "tags": _TAG_CACHE
+        })
+
     logger.info("Fetching workflow tags")
-    
+
     client = get_client()
-    
+
     try:
         # Try to get tags directly (n8n 1.0+)
         data = await client.get("/tags")
@@ -123,15 +156,19 @@ async def get_workflow_tags() -> str:
         logger.info("Tags endpoint not available, extracting from workflows")
         data = await client.get("/workflows")
         workflows = data.get("data", [])
-        
-        tag_set = set()
-        for wf in workflows:
-            for tag in wf.get("tags", []):
-                tag_set.add(tag.get("name"))
-        
+
+        tag_set = {
+            tag["name"]
+            for tag in chain.from_iterable(wf.get("tags", ()) for wf in workflows)
+            if tag.get("name")
+        }
+
         tags = [{"name": t} for t in sorted(tag_set)]
-    
-    return json.dumps({
+
+    _TAG_CACHE = tags
+    _TAG_CACHE_AT = time.monotonic()
+
+    return _dumps({
         "status": "success",
         "tags": tags
-    }, indent=2)
+    })
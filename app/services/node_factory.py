@@ -2,15 +2,16 @@
 Node Factory Service - Custom Node Creation
 Enables scaffolding, building, and deploying custom n8n nodes.
 """
+import asyncio
 import json
 import os
-import subprocess
 from datetime import datetime
 from typing import Optional
 
 from app.core.config import settings
 from app.core.client import safe_tool
 from app.core.logging import gateway_logger as logger
+from app.services.packages import _run_npm
 
 
 def _get_custom_nodes_dir() -> str:
@@ -20,15 +21,8 @@ def _get_custom_nodes_dir() -> str:
     return custom_dir
 
 
-@safe_tool
-async def scaffold_custom_node(
-    node_name: str,
-    description: str = "Custom n8n node",
-    category: str = "Custom"
-) -> str:
-    """Create a boilerplate TypeScript custom node."""
-    logger.info(f"Scaffolding custom node: {node_name}")
-    
+def _do_scaffold(node_name: str, description: str, category: str) -> dict:
+    """Synchronous scaffold body; runs in a worker thread."""
     try:
         custom_dir = _get_custom_nodes_dir()
         safe_name = "".join(c if c.isalnum() else "" for c in node_name)
@@ -133,7 +127,7 @@ export class {safe_name} implements INodeType {{
         with open(tsc_path, "w", encoding="utf-8") as f:
             json.dump(tsconfig, f, indent=2)
         
-        return json.dumps({
+        return {
             "status": "success",
             "node_name": node_name,
             "safe_name": safe_name,
@@ -149,111 +143,109 @@ export class {safe_name} implements INodeType {{
                 "Run: npm run build",
                 "Copy dist/ to n8n custom nodes directory"
             ]
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
+
+
+@safe_tool
+async def scaffold_custom_node(
+    node_name: str,
+    description: str = "Custom n8n node",
+    category: str = "Custom"
+) -> str:
+    """Create a boilerplate TypeScript custom node."""
+    logger.info(f"Scaffolding custom node: {node_name}")
+    result = await asyncio.to_thread(_do_scaffold, node_name, description, category)
+    return json.dumps(result, indent=2)
 
 
 @safe_tool
 async def build_custom_node(node_name: str) -> str:
     """Build a custom node from TypeScript."""
     logger.info(f"Building custom node: {node_name}")
-    
+
     try:
-        custom_dir = _get_custom_nodes_dir()
+        custom_dir = await asyncio.to_thread(_get_custom_nodes_dir)
         safe_name = "".join(c if c.isalnum() else "" for c in node_name)
         node_dir = os.path.join(custom_dir, safe_name)
-        
-        if not os.path.exists(node_dir):
+
+        if not await asyncio.to_thread(os.path.exists, node_dir):
             return json.dumps({
                 "status": "error",
                 "error": f"Node directory not found: {node_dir}"
             }, indent=2)
         
         # Install dependencies
-        npm_install = subprocess.run(
-            ["npm", "install"],
-            cwd=node_dir,
-            capture_output=True,
-            text=True,
-            shell=True,
-            timeout=60
+        install_code, _, install_stderr = await _run_npm(
+            ["install"], cwd=node_dir, timeout=60
         )
-        
-        if npm_install.returncode != 0:
+
+        if install_code != 0:
             return json.dumps({
                 "status": "error",
                 "stage": "npm_install",
-                "error": npm_install.stderr[:500]
+                "error": install_stderr[:500]
             }, indent=2)
-        
+
         # Build
-        npm_build = subprocess.run(
-            ["npm", "run", "build"],
-            cwd=node_dir,
-            capture_output=True,
-            text=True,
-            shell=True,
-            timeout=60
+        build_code, build_stdout, build_stderr = await _run_npm(
+            ["run", "build"], cwd=node_dir, timeout=60
         )
-        
-        if npm_build.returncode != 0:
+
+        if build_code != 0:
             return json.dumps({
                 "status": "error",
                 "stage": "build",
-                "error": npm_build.stderr[:500]
+                "error": build_stderr[:500]
             }, indent=2)
         
         # Check dist folder
         dist_dir = os.path.join(node_dir, "dist")
-        if os.path.exists(dist_dir):
-            files = os.listdir(dist_dir)
-        else:
-            files = []
-        
+        files = await asyncio.to_thread(
+            lambda: os.listdir(dist_dir) if os.path.exists(dist_dir) else []
+        )
+
         return json.dumps({
             "status": "success",
             "node_name": node_name,
-            "build_output": npm_build.stdout[:300] if npm_build.stdout else "Build complete",
+            "build_output": build_stdout[:300] if build_stdout else "Build complete",
             "dist_files": files,
             "next_step": "Run deploy_custom_node to install in n8n"
         }, indent=2)
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         return json.dumps({"status": "error", "error": "Build timed out"}, indent=2)
     except Exception as e:
         return json.dumps({"status": "error", "error": str(e)}, indent=2)
 
 
-@safe_tool
-async def list_custom_nodes() -> str:
-    """List all scaffolded custom nodes."""
-    logger.info("Listing custom nodes")
-    
+def _do_list() -> dict:
+    """Synchronous directory scan body; runs in a worker thread."""
     try:
         custom_dir = _get_custom_nodes_dir()
-        
+
         if not os.path.exists(custom_dir):
-            return json.dumps({
+            return {
                 "status": "success",
                 "nodes": [],
                 "directory": custom_dir
-            }, indent=2)
-        
+            }
+
         nodes = []
         for item in os.listdir(custom_dir):
             item_path = os.path.join(custom_dir, item)
             if os.path.isdir(item_path):
                 pkg_path = os.path.join(item_path, "package.json")
                 dist_path = os.path.join(item_path, "dist")
-                
+
                 node_info = {
                     "name": item,
                     "path": item_path,
                     "has_package_json": os.path.exists(pkg_path),
                     "is_built": os.path.exists(dist_path)
                 }
-                
-                if os.path.exists(pkg_path):
+
+                if node_info["has_package_json"]:
                     try:
                         with open(pkg_path) as f:
                             pkg = json.load(f)
@@ -261,17 +253,24 @@ async def list_custom_nodes() -> str:
                         node_info["description"] = pkg.get("description")
                     except:
                         pass
-                
+
                 nodes.append(node_info)
-        
-        return json.dumps({
+
+        return {
             "status": "success",
             "directory": custom_dir,
             "node_count": len(nodes),
             "nodes": nodes
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
+
+
+@safe_tool
+async def list_custom_nodes() -> str:
+    """List all scaffolded custom nodes."""
+    logger.info("Listing custom nodes")
+    return json.dumps(await asyncio.to_thread(_do_list), indent=2)
 
 
 @safe_tool
@@ -2,6 +2,7 @@
 Orchestration Service - Environment Management & Documentation
 Handles workflow promotion, linting, and auto-documentation.
 """
+import asyncio
 import json
 import os
 from datetime import datetime
@@ -10,6 +11,9 @@ from typing import Dict, Any, Optional, List
 from app.core.client import get_client, safe_tool
 from app.core.config import settings
 from app.core.logging import gateway_logger as logger
+# Reuse the surgery-side TTL cache: lint -> docs -> deps on one workflow
+# is a common review flow, and each leg used to re-fetch the same body
+from app.services.live_surgery import _get_workflow
 
 
 def _get_docs_dir() -> str:
@@ -19,17 +23,16 @@ def _get_docs_dir() -> str:
     return docs_dir
 
 
-@safe_tool
-async def workflow_lint(workflow_id: str) -> str:
-    """Lint a workflow for common anti-patterns and issues."""
+async def _workflow_lint(workflow_id: str) -> Dict[str, Any]:
+    """Dict-returning core of workflow_lint for in-process callers."""
     logger.info(f"Linting workflow: {workflow_id}")
     client = get_client()
     
     try:
-        workflow = await client.get(f"/workflows/{workflow_id}")
+        workflow = await _get_workflow(client, workflow_id)
         nodes = workflow.get("nodes", [])
         connections = workflow.get("connections", {})
-        
+
         issues = []
         
         # Check naming conventions
@@ -88,7 +91,7 @@ async def workflow_lint(workflow_id: str) -> str:
         
         passed = len([i for i in issues if i["severity"] == "error"]) == 0
         
-        return json.dumps({
+        return {
             "status": "success",
             "workflow_id": workflow_id,
             "passed": passed,
@@ -96,19 +99,24 @@ async def workflow_lint(workflow_id: str) -> str:
             "errors": len([i for i in issues if i["severity"] == "error"]),
             "warnings": len([i for i in issues if i["severity"] == "warning"]),
             "issues": issues
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
 
 
 @safe_tool
-async def generate_documentation(workflow_id: str) -> str:
-    """Generate markdown documentation for a workflow."""
+async def workflow_lint(workflow_id: str) -> str:
+    """Lint a workflow for common anti-patterns and issues."""
+    return json.dumps(await _workflow_lint(workflow_id), indent=2)
+
+
+async def _render_documentation(workflow_id: str) -> Dict[str, Any]:
+    """Render docs for one workflow in memory; no file I/O happens here."""
     logger.info(f"Generating docs for: {workflow_id}")
     client = get_client()
-    
+
     try:
-        workflow = await client.get(f"/workflows/{workflow_id}")
+        workflow = await _get_workflow(client, workflow_id)
         name = workflow.get("name", "Unknown")
         nodes = workflow.get("nodes", [])
         connections = workflow.get("connections", {})
@@ -169,23 +177,44 @@ async def generate_documentation(workflow_id: str) -> str:
         
         doc_content = "\n".join(doc_lines)
         
-        # Save to file
-        docs_dir = _get_docs_dir()
+        docs_dir = await asyncio.to_thread(_get_docs_dir)
         safe_name = "".join(c if c.isalnum() else "_" for c in name)
         doc_path = os.path.join(docs_dir, f"{safe_name}.md")
-        
-        with open(doc_path, "w", encoding="utf-8") as f:
-            f.write(doc_content)
-        
-        return json.dumps({
+
+        return {
             "status": "success",
             "workflow_id": workflow_id,
             "workflow_name": name,
             "doc_path": doc_path,
-            "doc_preview": doc_content[:500] + "..."
-        }, indent=2)
+            "doc_content": doc_content
+        }
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
+
+
+def _flush_docs(pairs: List[tuple]) -> None:
+    """Write rendered (path, content) docs to disk; runs in a worker thread."""
+    for path, content in pairs:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+async def _generate_documentation(workflow_id: str) -> Dict[str, Any]:
+    """Render and write docs for one workflow, returning the result dict."""
+    rendered = await _render_documentation(workflow_id)
+    if rendered.get("status") != "success":
+        return rendered
+
+    doc_content = rendered.pop("doc_content")
+    await asyncio.to_thread(_flush_docs, [(rendered["doc_path"], doc_content)])
+    rendered["doc_preview"] = doc_content[:500] + "..."
+    return rendered
+
+
+@safe_tool
+async def generate_documentation(workflow_id: str) -> str:
+    """Generate markdown documentation for a workflow."""
+    return json.dumps(await _generate_documentation(workflow_id), indent=2)
 
 
 @safe_tool
@@ -193,27 +222,42 @@ async def export_all_documentation() -> str:
     """Generate documentation for all workflows."""
     logger.info("Generating docs for all workflows")
     client = get_client()
-    
+
     try:
         wf_data = await client.get("/workflows")
         workflows = wf_data.get("data", [])
-        
-        docs_dir = _get_docs_dir()
+
+        docs_dir = await asyncio.to_thread(_get_docs_dir)
+
+        # Each doc only needs its own workflow fetch, so run them
+        # concurrently; the semaphore keeps the fanout from piling
+        # dozens of simultaneous requests onto the n8n API
+        semaphore = asyncio.Semaphore(8)
+
+        async def _bounded(wf_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await _render_documentation(wf_id)
+
+        results = await asyncio.gather(
+            *(_bounded(wf["id"]) for wf in workflows),
+            return_exceptions=True
+        )
+
         generated = []
-        
-        for wf in workflows:
-            try:
-                result = await generate_documentation(wf["id"])
-                result_data = json.loads(result)
-                if result_data.get("status") == "success":
-                    generated.append({
-                        "id": wf["id"],
-                        "name": wf["name"],
-                        "doc_path": result_data.get("doc_path")
-                    })
-            except:
-                pass
-        
+        pending_writes = []
+        for wf, result_data in zip(workflows, results):
+            if isinstance(result_data, Exception):
+                continue
+            if result_data.get("status") == "success":
+                pending_writes.append(
+                    (result_data["doc_path"], result_data["doc_content"])
+                )
+                generated.append({
+                    "id": wf["id"],
+                    "name": wf["name"],
+                    "doc_path": result_data.get("doc_path")
+                })
+
         # Create index
         index_lines = [
             "# Workflow Documentation Index",
@@ -223,14 +267,17 @@ async def export_all_documentation() -> str:
             "## Workflows",
             ""
         ]
-        
+
         for doc in generated:
             index_lines.append(f"- [{doc['name']}]({os.path.basename(doc['doc_path'])})")
-        
+
         index_path = os.path.join(docs_dir, "INDEX.md")
-        with open(index_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(index_lines))
-        
+        pending_writes.append((index_path, "\n".join(index_lines)))
+
+        # One hop to a worker thread flushes every doc plus the index,
+        # instead of blocking the loop once per file
+        await asyncio.to_thread(_flush_docs, pending_writes)
+
         return json.dumps({
             "status": "success",
             "docs_directory": docs_dir,
@@ -248,9 +295,9 @@ async def get_workflow_dependencies(workflow_id: str) -> str:
     client = get_client()
     
     try:
-        workflow = await client.get(f"/workflows/{workflow_id}")
+        workflow = await _get_workflow(client, workflow_id)
         nodes = workflow.get("nodes", [])
-        
+
         credentials_used = set()
         sub_workflows = []
         external_services = set()
@@ -2,27 +2,88 @@
 Package Manager Service - Dependency Management
 Handles installation of community nodes via npm.
 """
+import asyncio
 import json
-import subprocess
 import os
-from typing import Optional, List
+import shutil
+from typing import List, Optional, Tuple
 
 from app.core.config import settings
 from app.core.client import safe_tool
 from app.core.logging import packages_logger as logger
 
 
+async def _run_npm(args: List[str], cwd: str, timeout: float = 120) -> Tuple[int, str, str]:
+    """
+    Run an npm command without a shell and without blocking the event loop.
+
+    shell=True with an argument list only ever ran the first token through
+    /bin/sh, and the synchronous wait froze every other tool for the
+    duration of the install. stdin is closed so npm can't stall waiting
+    for input it will never get.
+
+    Returns:
+        (returncode, stdout, stderr) with the streams decoded as text.
+    """
+    npm = shutil.which("npm") or "npm"
+    proc = await asyncio.create_subprocess_exec(
+        npm, *args,
+        cwd=cwd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.communicate()
+        raise
+    return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+
 def _get_n8n_custom_dir() -> str:
     """Get the path to n8n's custom nodes directory."""
     return os.path.join(settings.n8n_data_dir, "custom")
 
 
-def _ensure_custom_dir_exists():
-    """Create the custom nodes directory if it doesn't exist."""
+# One-shot bootstrap of the custom dir + manifest. The flag skips the
+# exists() syscalls on every install, and the lock keeps concurrent
+# installs from both deciding to write the manifest
+_bootstrap_done = False
+_bootstrap_lock = asyncio.Lock()
+
+
+async def _ensure_custom_dir_ready() -> str:
+    """Create the custom nodes directory and its package.json manifest once.
+
+    npm only needs a minimal manifest to record dependencies, so we write
+    it directly instead of spawning `npm init -y` (a full Node.js process)
+    for a file we can materialize with one json.dump.
+    """
+    global _bootstrap_done
     custom_dir = _get_n8n_custom_dir()
-    if not os.path.exists(custom_dir):
-        os.makedirs(custom_dir)
-        logger.info(f"Created custom nodes directory: {custom_dir}")
+    if _bootstrap_done:
+        return custom_dir
+
+    async with _bootstrap_lock:
+        if _bootstrap_done:
+            return custom_dir
+
+        def _bootstrap():
+            os.makedirs(custom_dir, exist_ok=True)
+            package_json = os.path.join(custom_dir, "package.json")
+            if not os.path.exists(package_json):
+                with open(package_json, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"name": "n8n-custom", "version": "1.0.0", "private": True},
+                        f,
+                        indent=2
+                    )
+                logger.info(f"Initialized manifest: {package_json}")
+
+        await asyncio.to_thread(_bootstrap)
+        _bootstrap_done = True
     return custom_dir
 
 
@@ -38,60 +99,43 @@ async def install_community_node(package_name: str, version: Optional[str] = Non
     Returns:
         JSON string with installation result.
     """
-    custom_dir = _ensure_custom_dir_exists()
-    
+    custom_dir = await _ensure_custom_dir_ready()
+
     # Build package spec
     package_spec = f"{package_name}@{version}" if version else package_name
-    
+
     logger.info(f"Installing community node: {package_spec}")
     logger.info(f"Installation directory: {custom_dir}")
-    
+
     try:
-        # Initialize package.json if it doesn't exist
-        package_json = os.path.join(custom_dir, "package.json")
-        if not os.path.exists(package_json):
-            logger.info("Initializing package.json in custom directory")
-            init_result = subprocess.run(
-                ["npm", "init", "-y"],
-                cwd=custom_dir,
-                capture_output=True,
-                text=True,
-                shell=True
-            )
-            if init_result.returncode != 0:
-                raise RuntimeError(f"npm init failed: {init_result.stderr}")
-        
         # Install the package
-        result = subprocess.run(
-            ["npm", "install", package_spec, "--save"],
+        returncode, stdout, stderr = await _run_npm(
+            ["install", package_spec, "--save"],
             cwd=custom_dir,
-            capture_output=True,
-            text=True,
-            shell=True,
             timeout=120  # 2 minute timeout
         )
-        
-        if result.returncode == 0:
+
+        if returncode == 0:
             logger.info(f"Successfully installed: {package_spec}")
             return json.dumps({
                 "status": "success",
                 "package": package_name,
                 "version": version or "latest",
                 "install_path": custom_dir,
-                "output": result.stdout[-500:] if result.stdout else "",
+                "output": stdout[-500:] if stdout else "",
                 "restart_required": True,
                 "restart_message": "⚠️ Restart n8n to load the new node. Run: n8n restart (or restart the Docker container)"
             }, indent=2)
         else:
-            logger.error(f"Installation failed: {result.stderr}")
+            logger.error(f"Installation failed: {stderr}")
             return json.dumps({
                 "status": "error",
                 "package": package_name,
-                "error": result.stderr[-500:] if result.stderr else "Unknown error",
-                "return_code": result.returncode
+                "error": stderr[-500:] if stderr else "Unknown error",
+                "return_code": returncode
             }, indent=2)
-            
-    except subprocess.TimeoutExpired:
+
+    except asyncio.TimeoutError:
         logger.error(f"Installation timed out for: {package_name}")
         return json.dumps({
             "status": "error",
@@ -129,16 +173,13 @@ async def uninstall_community_node(package_name: str) -> str:
     logger.info(f"Uninstalling community node: {package_name}")
     
     try:
-        result = subprocess.run(
-            ["npm", "uninstall", package_name, "--save"],
+        returncode, _, stderr = await _run_npm(
+            ["uninstall", package_name, "--save"],
             cwd=custom_dir,
-            capture_output=True,
-            text=True,
-            shell=True,
             timeout=60
         )
-        
-        if result.returncode == 0:
+
+        if returncode == 0:
             logger.info(f"Successfully uninstalled: {package_name}")
             return json.dumps({
                 "status": "success",
@@ -149,7 +190,7 @@ async def uninstall_community_node(package_name: str) -> str:
             return json.dumps({
                 "status": "error",
                 "package": package_name,
-                "error": result.stderr
+                "error": stderr
             }, indent=2)
             
     except Exception as e:
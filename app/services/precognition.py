@@ -62,12 +62,11 @@ async def traffic_anomaly_detection(hours: int = 24, threshold_std: float = 2.0)
         return json.dumps({"status": "error", "error": str(e)}, indent=2)
 
 
-@safe_tool
-async def token_burn_rate_prediction(model_cost_per_1k: float = 0.002) -> str:
-    """Predict API token/cost burn rate based on usage patterns."""
+async def _token_burn_rate_prediction(model_cost_per_1k: float = 0.002) -> Dict[str, Any]:
+    """Dict-returning core of token_burn_rate_prediction for in-process callers."""
     logger.info("Calculating token burn rate")
     client = get_client()
-    
+
     try:
         exec_data = await client.get("/executions", params={"limit": 200})
         executions = exec_data.get("data", [])
@@ -81,23 +80,28 @@ async def token_burn_rate_prediction(model_cost_per_1k: float = 0.002) -> str:
         hourly_tokens = ai_executions / 24 * tokens_per_exec
         daily_cost = (hourly_tokens * 24 / 1000) * model_cost_per_1k
         
-        return json.dumps({
+        return {
             "status": "success",
             "ai_executions": ai_executions,
             "daily_tokens_estimate": round(hourly_tokens * 24),
             "daily_cost_usd": round(daily_cost, 2),
             "monthly_cost_usd": round(daily_cost * 30, 2)
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
 
 
 @safe_tool
-async def predict_failures() -> str:
-    """Predict potential failures based on historical patterns."""
+async def token_burn_rate_prediction(model_cost_per_1k: float = 0.002) -> str:
+    """Predict API token/cost burn rate based on usage patterns."""
+    return json.dumps(await _token_burn_rate_prediction(model_cost_per_1k), indent=2)
+
+
+async def _predict_failures() -> Dict[str, Any]:
+    """Dict-returning core of predict_failures for in-process callers."""
     logger.info("Predicting failures")
     client = get_client()
-    
+
     try:
         exec_data = await client.get("/executions", params={"limit": 500})
         executions = exec_data.get("data", [])
@@ -117,9 +121,15 @@ async def predict_failures() -> str:
                     at_risk.append({"workflow_id": wf_id, "error_rate": round(rate * 100, 1)})
         
         at_risk.sort(key=lambda x: x["error_rate"], reverse=True)
-        return json.dumps({"status": "success", "at_risk": at_risk[:10]}, indent=2)
+        return {"status": "success", "at_risk": at_risk[:10]}
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
+
+
+@safe_tool
+async def predict_failures() -> str:
+    """Predict potential failures based on historical patterns."""
+    return json.dumps(await _predict_failures(), indent=2)
 
 
 @safe_tool
@@ -8,6 +8,7 @@ from typing import Dict, Any, Optional, List
 
 from app.core.client import get_client, safe_tool
 from app.core.logging import gateway_logger as logger
+from app.services.live_surgery import _invalidate_workflow
 
 # PII patterns
 PII_PATTERNS = {
@@ -19,9 +20,8 @@ PII_PATTERNS = {
 }
 
 
-@safe_tool
-async def security_audit_workflow(workflow_id: str) -> str:
-    """Perform a security audit on a workflow."""
+async def _security_audit_workflow(workflow_id: str) -> Dict[str, Any]:
+    """Dict-returning core of security_audit_workflow for in-process callers."""
     logger.info(f"Security audit for: {workflow_id}")
     client = get_client()
     
@@ -77,15 +77,21 @@ async def security_audit_workflow(workflow_id: str) -> str:
                        "high" if severity_counts["high"] > 0 else \
                        "medium" if severity_counts["medium"] > 2 else "low"
         
-        return json.dumps({
+        return {
             "status": "success",
             "workflow_id": workflow_id,
             "overall_risk": overall_risk,
             "issue_counts": severity_counts,
             "issues": issues
-        }, indent=2)
+        }
     except Exception as e:
-        return json.dumps({"status": "error", "error": str(e)}, indent=2)
+        return {"status": "error", "error": str(e)}
+
+
+@safe_tool
+async def security_audit_workflow(workflow_id: str) -> str:
+    """Perform a security audit on a workflow."""
+    return json.dumps(await _security_audit_workflow(workflow_id), indent=2)
 
 
 @safe_tool
@@ -136,6 +142,7 @@ async def emergency_deactivate_all(dry_run: bool = True) -> str:
             for wf in active_workflows:
                 try:
                     await client.post(f"/workflows/{wf['id']}/deactivate")
+                    _invalidate_workflow(wf["id"])
                     deactivated.append(wf["id"])
                 except Exception as e:
                     logger.warning(f"Failed to deactivate {wf['id']}: {e}")